@@ -1,15 +1,30 @@
 """MindfulMe - Mental Health Tracker Main Application."""
 
+import os
 import streamlit as st
-from utils.session_manager import get_current_page, initialize_session
+from utils.session_manager import get_current_page, init_session_state, logout, set_page
 from pages.auth import render as render_auth
 from pages.onboarding import render as render_onboarding
 from pages.clinical_assessment import render as render_clinical
 from pages.dashboard import render as render_dashboard
+from services.ai_service import warm_up_models
 
-# Inject custom CSS
-with open('static/styles.css') as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+CSS_PATH = 'static/styles.css'
+
+# Sidebar navigation entries as (label, page key)
+_NAV_PAGES = (
+    ("Dashboard", "dashboard"),
+    ("Clinical Assessment", "clinical"),
+)
+
+# Page renderers keyed by the session "page" value; unknown pages fall back to
+# the dashboard for logged-in users and to auth otherwise
+_ROUTES = {
+    "auth": render_auth,
+    "onboarding": render_onboarding,
+    "clinical": render_clinical,
+    "dashboard": render_dashboard,
+}
 
 # Configure page
 st.set_page_config(
@@ -19,61 +34,58 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_data(show_spinner=False)
+def _load_css(path: str, mtime: float) -> str:
+    """Read the stylesheet once per file version (mtime keys the cache)."""
+    with open(path) as f:
+        return f.read()
+
+
 def main():
     """Main application entry point."""
-    # Initialize session state
-    initialize_session()
+    # Inject custom CSS
+    css = _load_css(CSS_PATH, os.path.getmtime(CSS_PATH))
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-    # Get current page from session
-    current_page = get_current_page()
+    # Start the sentiment model loading off the interactive path
+    warm_up_models()
+
+    # Initialize session state
+    init_session_state()
+    ss = st.session_state
 
     # Render sidebar navigation if user is logged in
-    if st.session_state.get('user_id'):
-        render_sidebar()
+    if ss.get('user_id'):
+        with st.sidebar:
+            render_sidebar(ss.get('username') or 'User')
 
     # Route to appropriate page
-    if current_page == "auth":
-        render_auth()
-    elif current_page == "onboarding":
-        render_onboarding()
-    elif current_page == "clinical":
-        render_clinical()
-    elif current_page == "dashboard":
-        render_dashboard()
-    else:
-        # Default to auth page
-        render_auth()
-
-def render_sidebar():
-    """Render the sidebar navigation."""
-    with st.sidebar:
-        st.markdown("## 🧠 MindfulMe")
-
-        # User info
-        username = st.session_state.get('username', 'User')
-        st.markdown(f"**Welcome, {username}!**")
-
-        # Navigation menu
-        st.markdown("---")
-
-        pages = {
-            "Dashboard": "dashboard",
-            "Clinical Assessment": "clinical",
-            "Settings": "settings"
-        }
-
-        for page_name, page_key in pages.items():
-            if st.button(page_name, key=f"nav_{page_key}", use_container_width=True):
-                st.session_state.current_page = page_key
-                st.rerun()
-
-        st.markdown("---")
-
-        # Logout button
-        if st.button("Logout", key="logout", use_container_width=True):
-            from utils.session_manager import logout_user
-            logout_user()
-            st.rerun()
+    fallback = render_dashboard if ss.get('user_id') else render_auth
+    _ROUTES.get(get_current_page(), fallback)()
+
+
+def render_sidebar(username: str):
+    """Render the sidebar navigation (call inside a ``with st.sidebar`` block)."""
+    st.markdown("## 🧠 MindfulMe")
+
+    # User info
+    st.markdown(f"**Welcome, {username}!**")
+
+    # Navigation menu
+    st.markdown("---")
+
+    # Callbacks update the page before the click's rerun, so the new page
+    # renders in that same run without a second st.rerun()
+    for page_name, page_key in _NAV_PAGES:
+        st.button(page_name, key=f"nav_{page_key}", use_container_width=True,
+                  on_click=set_page, args=(page_key,))
+
+    st.markdown("---")
+
+    # Logout button
+    st.button("Logout", key="logout", use_container_width=True, on_click=logout)
+
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,92 @@
 """Glassmorphism card components."""
 
+import html
+import math
+import re
 import streamlit as st
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+# Card templates, filled with str.format_map
+_GLASS_CARD_TMPL = """
+    <div class="glass-card">
+        {title}
+        {subtitle}
+        {content}
+    </div>
+    """
+_GLASS_TITLE_TMPL = '<div class="glass-card-title">{}</div>'
+_GLASS_SUBTITLE_TMPL = '<div class="glass-card-subtitle">{}</div>'
+
+_BURNOUT_TMPL = """
+    <div class="burnout-indicator burnout-{level}">
+        <span style="font-size: 1.5rem;">{icon}</span>
+        <div>
+            <div style="font-weight: 600; color: {color};">{level_upper} RISK</div>
+            <div style="font-size: 0.9rem; opacity: 0.8;">{message}</div>
+        </div>
+    </div>
+    """
+_BURNOUT_ICONS = {"low": "✓", "medium": "⚠"}
+
+_JOURNAL_TMPL = """
+    <div class="journal-entry">
+        <div class="journal-date">{date_str} {badge}</div>
+        <div class="journal-text">{text}</div>
+    </div>
+    """
+_DEFAULT_TEAL = "#80CBC4"
+
+# Sentiment badge colors; both label cases are listed so lookups skip .upper()
+_SENTIMENT_COLORS = {
+    "POSITIVE": "#66BB6A",
+    "NEGATIVE": "#EF5350",
+    "NEUTRAL": _DEFAULT_TEAL,
+    "positive": "#66BB6A",
+    "negative": "#EF5350",
+    "neutral": _DEFAULT_TEAL,
+}
+
+# Mood score colors indexed by score (1-10): red, orange, teal, green
+_MOOD_COLORS = (
+    None,
+    "#EF5350", "#EF5350", "#EF5350",
+    "#FFA726", "#FFA726",
+    "#80CBC4", "#80CBC4",
+    "#66BB6A", "#66BB6A", "#66BB6A",
+)
+
+_CARD_GRID_TMPL = '<div class="card-grid" style="--card-grid-cols: {cols};">{cards}</div>'
+
+_SENTIMENT_BADGE_TMPL = '<span class="severity-badge" style="background: {color}20; color: {color};">{sentiment}</span>'
+
+
+def _truncate(text: str, limit: int = 200) -> str:
+    """HTML-escape user text, cutting it to `limit` characters with a trailing ellipsis."""
+    if len(text) > limit:
+        return html.escape(text[:limit]) + "..."
+    return html.escape(text)
+
+
+def _join_cards(card_htmls: List[str]) -> str:
+    """
+    Join card fragments into one HTML block.
+
+    The builders' templates start with a newline and end with an indented
+    blank line; left in place, that blank line ends the markdown HTML block
+    and the next (indented) card renders as a code block.
+    """
+    return "".join(card_html.strip() for card_html in card_htmls)
+
+
+def glass_card_html(content: str, title: Optional[str] = None, subtitle: Optional[str] = None) -> str:
+    """Build the HTML for a glassmorphism card."""
+    return _GLASS_CARD_TMPL.format_map({
+        "title": _GLASS_TITLE_TMPL.format(title) if title else "",
+        "subtitle": _GLASS_SUBTITLE_TMPL.format(subtitle) if subtitle else "",
+        "content": content,
+    })
 
 
 def render_glass_card(content: str, title: Optional[str] = None, subtitle: Optional[str] = None) -> None:
@@ -13,17 +98,42 @@ def render_glass_card(content: str, title: Optional[str] = None, subtitle: Optio
         title: Optional card title
         subtitle: Optional card subtitle
     """
-    title_html = f'<div class="glass-card-title">{title}</div>' if title else ""
-    subtitle_html = f'<div class="glass-card-subtitle">{subtitle}</div>' if subtitle else ""
-    
-    html = f"""
-    <div class="glass-card">
-        {title_html}
-        {subtitle_html}
-        {content}
+    st.markdown(glass_card_html(content, title, subtitle), unsafe_allow_html=True)
+
+
+@contextmanager
+def glass_card(title: Optional[str] = None, subtitle: Optional[str] = None, key: Optional[str] = None) -> Iterator[None]:
+    """
+    Group Streamlit widgets inside a glassmorphism card.
+
+    The HTML cards above can't hold widgets, so this styles a keyed
+    st.container through its st-key-glass-card-* class instead.
+
+    Args:
+        title: Optional card title
+        subtitle: Optional card subtitle
+        key: Container key suffix; derived from the title when omitted
+    """
+    suffix = key or re.sub(r"[^a-z0-9]+", "-", (title or "card").lower()).strip("-")
+    with st.container(key=f"glass-card-{suffix}"):
+        if title:
+            st.markdown(_GLASS_TITLE_TMPL.format(title), unsafe_allow_html=True)
+        if subtitle:
+            st.markdown(_GLASS_SUBTITLE_TMPL.format(subtitle), unsafe_allow_html=True)
+        yield
+
+
+def auth_card_html(content: str, title: str = "MindfulMe", subtitle: str = "") -> str:
+    """Build the HTML for a centered authentication card."""
+    return f"""
+    <div class="auth-container">
+        <div class="auth-card">
+            <div class="brand-logo">{title}</div>
+            <div class="auth-subtitle">{subtitle}</div>
+            {content}
+        </div>
     </div>
     """
-    st.markdown(html, unsafe_allow_html=True)
 
 
 def render_auth_card(content: str, title: str = "MindfulMe", subtitle: str = "") -> None:
@@ -35,16 +145,17 @@ def render_auth_card(content: str, title: str = "MindfulMe", subtitle: str = "")
         title: Card title (default: MindfulMe)
         subtitle: Card subtitle
     """
-    html = f"""
-    <div class="auth-container">
-        <div class="auth-card">
-            <div class="brand-logo">{title}</div>
-            <div class="auth-subtitle">{subtitle}</div>
-            {content}
-        </div>
+    st.markdown(auth_card_html(content, title, subtitle), unsafe_allow_html=True)
+
+
+def recommendation_card_html(title: str, text: str, severity_class: str = "") -> str:
+    """Build the HTML for a recommendation card."""
+    return f"""
+    <div class="recommendation-card">
+        <div class="recommendation-title">{title}</div>
+        <div class="recommendation-text">{text}</div>
     </div>
     """
-    st.markdown(html, unsafe_allow_html=True)
 
 
 def render_recommendation_card(title: str, text: str, severity_class: str = "") -> None:
@@ -56,13 +167,16 @@ def render_recommendation_card(title: str, text: str, severity_class: str = "")
         text: Recommendation text
         severity_class: CSS class for severity (severity-minimal, severity-mild, etc.)
     """
-    html = f"""
-    <div class="recommendation-card">
-        <div class="recommendation-title">{title}</div>
-        <div class="recommendation-text">{text}</div>
-    </div>
+    st.markdown(recommendation_card_html(title, text, severity_class), unsafe_allow_html=True)
+
+
+def severity_badge_html(level: str, color: str) -> str:
+    """Build the HTML for a severity level badge."""
+    return f"""
+    <span class="severity-badge" style="background: {color}20; color: {color};">
+        {level}
+    </span>
     """
-    st.markdown(html, unsafe_allow_html=True)
 
 
 def render_severity_badge(level: str, color: str) -> None:
@@ -73,12 +187,18 @@ def render_severity_badge(level: str, color: str) -> None:
         level: Severity level text (e.g., "Mild", "Moderate")
         color: Badge color
     """
-    html = f"""
-    <span class="severity-badge" style="background: {color}20; color: {color};">
-        {level}
-    </span>
-    """
-    st.markdown(html, unsafe_allow_html=True)
+    st.markdown(severity_badge_html(level, color), unsafe_allow_html=True)
+
+
+def burnout_indicator_html(level: str, message: str, color: str) -> str:
+    """Build the HTML for a burnout risk indicator."""
+    return _BURNOUT_TMPL.format_map({
+        "level": level,
+        "level_upper": level.upper(),
+        "icon": _BURNOUT_ICONS.get(level, "⚡"),
+        "color": color,
+        "message": message,
+    })
 
 
 def render_burnout_indicator(level: str, message: str, color: str) -> None:
@@ -90,18 +210,20 @@ def render_burnout_indicator(level: str, message: str, color: str) -> None:
         message: Display message
         color: Indicator color
     """
-    icon = "✓" if level == "low" else ("⚠" if level == "medium" else "⚡")
+    st.markdown(burnout_indicator_html(level, message, color), unsafe_allow_html=True)
+
+
+def mood_display_html(score: int, label: str) -> str:
+    """Build the HTML for a large mood score display."""
+    # Color gradient from red (1) to green (10); fractional scores round up into their band
+    color = _MOOD_COLORS[min(max(math.ceil(score), 1), 10)]
     
-    html = f"""
-    <div class="burnout-indicator burnout-{level}">
-        <span style="font-size: 1.5rem;">{icon}</span>
-        <div>
-            <div style="font-weight: 600; color: {color};">{level.upper()} RISK</div>
-            <div style="font-size: 0.9rem; opacity: 0.8;">{message}</div>
-        </div>
+    return f"""
+    <div class="glass-card" style="text-align: center;">
+        <div class="mood-score" style="color: {color};">{score}</div>
+        <div class="mood-score-label">{label}</div>
     </div>
     """
-    st.markdown(html, unsafe_allow_html=True)
 
 
 def render_mood_display(score: int, label: str) -> None:
@@ -112,23 +234,21 @@ def render_mood_display(score: int, label: str) -> None:
         score: Mood score (1-10)
         label: Mood label description
     """
-    # Color gradient from red (1) to green (10)
-    if score <= 3:
-        color = "#EF5350"  # Red
-    elif score <= 5:
-        color = "#FFA726"  # Orange
-    elif score <= 7:
-        color = "#80CBC4"  # Teal
-    else:
-        color = "#66BB6A"  # Green
+    st.markdown(mood_display_html(score, label), unsafe_allow_html=True)
+
+
+def journal_entry_html(date_str: str, text: str, sentiment: Optional[str] = None) -> str:
+    """Build the HTML for a journal entry card."""
+    sentiment_badge = ""
+    if sentiment:
+        color = _SENTIMENT_COLORS.get(sentiment, _DEFAULT_TEAL)
+        sentiment_badge = _SENTIMENT_BADGE_TMPL.format(color=color, sentiment=sentiment)
     
-    html = f"""
-    <div class="glass-card" style="text-align: center;">
-        <div class="mood-score" style="color: {color};">{score}</div>
-        <div class="mood-score-label">{label}</div>
-    </div>
-    """
-    st.markdown(html, unsafe_allow_html=True)
+    return _JOURNAL_TMPL.format_map({
+        "date_str": date_str,
+        "badge": sentiment_badge,
+        "text": _truncate(text),
+    })
 
 
 def render_journal_entry(date_str: str, text: str, sentiment: Optional[str] = None) -> None:
@@ -140,23 +260,19 @@ def render_journal_entry(date_str: str, text: str, sentiment: Optional[str] = No
         text: Journal entry text
         sentiment: Optional sentiment label
     """
-    sentiment_badge = ""
-    if sentiment:
-        sentiment_colors = {
-            "POSITIVE": "#66BB6A",
-            "NEGATIVE": "#EF5350",
-            "NEUTRAL": "#80CBC4"
-        }
-        color = sentiment_colors.get(sentiment.upper(), "#80CBC4")
-        sentiment_badge = f'<span class="severity-badge" style="background: {color}20; color: {color};">{sentiment}</span>'
-    
-    html = f"""
-    <div class="journal-entry">
-        <div class="journal-date">{date_str} {sentiment_badge}</div>
-        <div class="journal-text">{text[:200]}{'...' if len(text) > 200 else ''}</div>
+    st.markdown(journal_entry_html(date_str, text, sentiment), unsafe_allow_html=True)
+
+
+def stat_card_html(title: str, value: str, subtitle: str = "", icon: str = "") -> str:
+    """Build the HTML for a statistics card."""
+    return f"""
+    <div class="glass-card" style="text-align: center; padding: 1.5rem;">
+        <div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>
+        <div style="font-size: 2rem; font-weight: 700; color: #00897B;">{value}</div>
+        <div style="font-weight: 600; color: #263238;">{title}</div>
+        <div style="font-size: 0.85rem; opacity: 0.7;">{subtitle}</div>
     </div>
     """
-    st.markdown(html, unsafe_allow_html=True)
 
 
 def render_stat_card(title: str, value: str, subtitle: str = "", icon: str = "") -> None:
@@ -169,12 +285,30 @@ def render_stat_card(title: str, value: str, subtitle: str = "", icon: str = "")
         subtitle: Optional subtitle
         icon: Optional emoji icon
     """
-    html = f"""
-    <div class="glass-card" style="text-align: center; padding: 1.5rem;">
-        <div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>
-        <div style="font-size: 2rem; font-weight: 700; color: #00897B;">{value}</div>
-        <div style="font-weight: 600; color: #263238;">{title}</div>
-        <div style="font-size: 0.85rem; opacity: 0.7;">{subtitle}</div>
-    </div>
+    st.markdown(stat_card_html(title, value, subtitle, icon), unsafe_allow_html=True)
+
+
+def render_cards_batch(card_htmls: List[str]) -> None:
+    """
+    Render several cards with a single markdown element.
+    
+    Args:
+        card_htmls: HTML strings from the *_html builders in this module
+    """
+    if card_htmls:
+        st.markdown(_join_cards(card_htmls), unsafe_allow_html=True)
+
+
+def render_card_grid(card_htmls: List[str], cols: int = 3) -> None:
+    """
+    Render several cards laid out in a CSS grid with a single markdown element.
+    
+    Args:
+        card_htmls: HTML strings from the *_html builders in this module
+        cols: Number of grid columns (collapses to one on narrow screens)
     """
-    st.markdown(html, unsafe_allow_html=True)
+    if card_htmls:
+        st.markdown(
+            _CARD_GRID_TMPL.format(cols=cols, cards=_join_cards(card_htmls)),
+            unsafe_allow_html=True
+        )
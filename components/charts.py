@@ -1,14 +1,172 @@
-"""Chart components using Plotly."""
+"""Chart components using Plotly and inline SVG."""
 
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import List, Optional, Tuple
-from datetime import date, datetime
+import functools
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+from datetime import date
 import streamlit as st
 
 from config.constants import COLORS
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
+
+@functools.lru_cache(maxsize=1)
+def _go():
+    """Import plotly.graph_objects on first use so pages without charts skip the load."""
+    import plotly.graph_objects as go
+    return go
+
+
+# Layout values shared by every chart; built once instead of per call
+_TRANSPARENT = 'rgba(0,0,0,0)'
+_DONUT_MARGIN = dict(t=50, b=20, l=20, r=20)
+_CHARCOAL_FONT = dict(color=COLORS["charcoal"])
+_TITLE_FONT_16 = dict(size=16, color=COLORS["charcoal"])
+_TITLE_FONT_18 = dict(size=18, color=COLORS["charcoal"])
+
+# plotly.js configs: read-only charts skip the hover/drag machinery entirely
+_CHART_CONFIG = {'displayModeBar': False}
+_STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+_MOOD_LINE = dict(color=COLORS["dark_teal"], width=3, shape='spline')
+_MOOD_LINE_GL = dict(color=COLORS["dark_teal"], width=3)
+_MOOD_MARKER = dict(size=10, color=COLORS["dark_teal"], line=dict(color=COLORS["white"], width=2))
+_MOOD_XAXIS = dict(title="Date", showgrid=False, tickfont=_CHARCOAL_FONT)
+_MOOD_YAXIS = dict(
+    title="Mood Score",
+    range=[0, 11],
+    tickvals=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+    showgrid=True,
+    gridcolor='rgba(0,0,0,0.05)',
+    tickfont=_CHARCOAL_FONT,
+)
+_MOOD_MARGIN = dict(t=60, b=40, l=40, r=20)
+
+_SLEEP_XAXIS = dict(title="Date", tickfont=_CHARCOAL_FONT)
+_SLEEP_YAXIS = dict(title="Hours", range=[0, 12], tickfont=_CHARCOAL_FONT)
+_SLEEP_MARGIN = dict(t=50, b=40, l=40, r=20)
+
+# Sleep bar colors: <6h, 6-7h, 7-9h (inclusive), >9h
+_SLEEP_BINS = np.array([6, 7, np.nextafter(9, np.inf)])
+_SLEEP_PALETTE = (
+    COLORS["error_red"],
+    COLORS["warning_orange"],
+    COLORS["success_green"],
+    COLORS["warning_orange"],
+)
+
+# Series longer than this are downsampled before plotting
+MAX_CHART_POINTS = 500
+# Line series longer than this are drawn with WebGL; below it SVG starts faster
+_WEBGL_MIN_POINTS = 200
+
+
+def _lttb_indices(values: List[float], threshold: int) -> np.ndarray:
+    """
+    Pick the indices to keep using Largest-Triangle-Three-Buckets.
+    
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    
+    Args:
+        values: Series values (None is treated as missing)
+        threshold: Number of points to keep
+        
+    Returns:
+        Sorted array of indices into the original series
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    y = np.fromiter((np.nan if v is None else v for v in values), dtype=float, count=n)
+    x = np.arange(n, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = np.nanmean(y[end:next_end]) if not np.isnan(y[end:next_end]).all() else y[a]
+        
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        indices[i + 1] = a
+    indices[-1] = n - 1
+    
+    return indices
+
+
+def _downsample(dates: List, values: List, threshold: int = MAX_CHART_POINTS) -> Tuple[List, List]:
+    """Downsample a (dates, values) series with LTTB when it exceeds the threshold."""
+    if len(values) <= threshold:
+        return dates, values
+    
+    keep = _lttb_indices(values, threshold)
+    return [dates[i] for i in keep], [values[i] for i in keep]
+
+
+def _fmt_dates(dates: List) -> List[str]:
+    """Format dates as "Jan 01" labels in one vectorized pass; unparseable values fall back to str()."""
+    raw = pd.Series(dates, dtype=object)
+    parsed = pd.to_datetime(raw, errors='coerce', format='mixed')
+    return parsed.dt.strftime("%b %d").fillna(raw.astype(str)).tolist()
+
+_SENTIMENT_CHART_COLORS = {
+    "POSITIVE": COLORS["success_green"],
+    "NEGATIVE": COLORS["error_red"],
+    "NEUTRAL": COLORS["accent_teal"],
+}
+
+
+# Donut drawn as two SVG circles; r gives a circumference of 100 so the
+# dash array can be written directly as a percentage. The stroke width
+# leaves a hole of 70% of the outer radius, as the Plotly version did.
+_DONUT_RADIUS = 15.91549430918954
+_DONUT_STROKE = 5.62
+
+_DONUT_SVG_TMPL = """
+<div style="text-align: center;">
+    <div style="font-size: 16px; color: {charcoal};">{title}</div>
+    <svg viewBox="0 0 42 42" width="100%" style="max-width: 250px;">
+        <circle cx="21" cy="21" r="{r}" fill="none" stroke="{track}" stroke-width="{w}"></circle>
+        <circle cx="21" cy="21" r="{r}" fill="none" stroke="{color}" stroke-width="{w}"
+                stroke-dasharray="{pct:.2f} {rest:.2f}" stroke-dashoffset="25"></circle>
+        <text x="21" y="21" text-anchor="middle" dominant-baseline="central"
+              font-size="6" font-weight="bold" fill="{charcoal}">{center_text}</text>
+    </svg>
+</div>
+"""
+
+
+def _donut_svg(pct: float, color: str, center_text: str, title: str = "") -> str:
+    """Build the donut chart markup for a 0-100 fill percentage."""
+    pct = min(max(pct, 0.0), 100.0)
+    return _DONUT_SVG_TMPL.format_map({
+        "r": _DONUT_RADIUS,
+        "w": _DONUT_STROKE,
+        "pct": pct,
+        "rest": 100.0 - pct,
+        "color": color,
+        "track": COLORS["light_gray"],
+        "charcoal": COLORS["charcoal"],
+        "center_text": center_text,
+        "title": title,
+    })
+
+
+@st.fragment
 def render_donut_chart(
     score: int,
     max_score: int,
@@ -29,81 +187,40 @@ def render_donut_chart(
     if color is None:
         color = COLORS["dark_teal"]
     
-    remaining = max_score - score
     percentage = (score / max_score) * 100 if max_score > 0 else 0
-    
-    fig = go.Figure(data=[go.Pie(
-        values=[score, remaining],
-        hole=0.7,
-        marker_colors=[color, COLORS["light_gray"]],
-        textinfo='none',
-        hoverinfo='skip',
-        showlegend=False
-    )])
-    
-    # Add center text
     center_text = f"{percentage:.0f}%" if show_percentage else f"{score}/{max_score}"
     
-    fig.add_annotation(
-        text=f"<b>{center_text}</b>",
-        x=0.5, y=0.5,
-        font_size=24,
-        font_color=COLORS["charcoal"],
-        showarrow=False
-    )
-    
-    fig.update_layout(
-        title=dict(text=title, font=dict(size=16, color=COLORS["charcoal"]), x=0.5),
-        margin=dict(t=50, b=20, l=20, r=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        height=250,
-        width=250,
-    )
-    
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    st.markdown(_donut_svg(percentage, color, center_text, title), unsafe_allow_html=True)
 
 
-def render_mood_line_chart(
-    dates: List[date],
-    mood_scores: List[int],
-    title: str = "Mood Trends",
-    show_markers: bool = True
-) -> None:
-    """
-    Render a line chart showing mood over time.
-    
-    Args:
-        dates: List of dates
-        mood_scores: List of mood scores (1-10)
-        title: Chart title
-        show_markers: Whether to show data point markers
-    """
-    if not dates or not mood_scores:
-        st.info("No mood data available yet. Start logging your mood!")
-        return
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _build_mood_line_fig(
+    dates: Tuple,
+    mood_scores: Tuple[int, ...],
+    title: str,
+    show_markers: bool
+) -> "go.Figure":
+    """Build the mood line figure; cached so identical series skip downsampling and Plotly validation."""
+    dates, mood_scores = _downsample(dates, mood_scores)
     
     # Format dates for display
-    date_labels = [d.strftime("%b %d") if isinstance(d, (date, datetime)) else str(d) for d in dates]
+    date_labels = _fmt_dates(dates)
     
+    go = _go()
     fig = go.Figure()
     
-    # Add the main line
-    fig.add_trace(go.Scatter(
+    # Add the main line; scattergl has no spline shape, so it keeps straight segments
+    if len(mood_scores) > _WEBGL_MIN_POINTS:
+        scatter, line = go.Scattergl, _MOOD_LINE_GL
+    else:
+        scatter, line = go.Scatter, _MOOD_LINE
+    fig.add_trace(scatter(
         x=date_labels,
         y=mood_scores,
         mode='lines+markers' if show_markers else 'lines',
         name='Mood',
-        line=dict(
-            color=COLORS["dark_teal"],
-            width=3,
-            shape='spline'
-        ),
-        marker=dict(
-            size=10,
-            color=COLORS["dark_teal"],
-            line=dict(color=COLORS["white"], width=2)
-        ),
+        line=line,
+        marker=_MOOD_MARKER,
         fill='tozeroy',
         fillcolor='rgba(0, 137, 123, 0.1)',
         hovertemplate='%{x}<br>Mood: %{y}<extra></extra>'
@@ -114,113 +231,110 @@ def render_mood_line_chart(
                   annotation_text="Average", annotation_position="right")
     
     fig.update_layout(
-        title=dict(text=title, font=dict(size=18, color=COLORS["charcoal"])),
-        xaxis=dict(
-            title="Date",
-            showgrid=False,
-            tickfont=dict(color=COLORS["charcoal"]),
-        ),
-        yaxis=dict(
-            title="Mood Score",
-            range=[0, 11],
-            tickvals=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-            showgrid=True,
-            gridcolor='rgba(0,0,0,0.05)',
-            tickfont=dict(color=COLORS["charcoal"]),
-        ),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=60, b=40, l=40, r=20),
+        title=dict(text=title, font=_TITLE_FONT_18),
+        xaxis=_MOOD_XAXIS,
+        yaxis=_MOOD_YAXIS,
+        paper_bgcolor=_TRANSPARENT,
+        plot_bgcolor=_TRANSPARENT,
+        margin=_MOOD_MARGIN,
         height=350,
         hovermode='x unified',
         showlegend=False
     )
     
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
 
 
-def render_sentiment_pie_chart(
-    sentiment_counts: dict,
-    title: str = "Sentiment Distribution"
+@st.fragment
+def render_mood_line_chart(
+    dates: List[date],
+    mood_scores: List[int],
+    title: str = "Mood Trends",
+    show_markers: bool = True
 ) -> None:
     """
-    Render a pie chart showing sentiment distribution.
+    Render a line chart showing mood over time.
     
     Args:
-        sentiment_counts: Dict with sentiment labels as keys and counts as values
+        dates: List of dates
+        mood_scores: List of mood scores (1-10)
         title: Chart title
+        show_markers: Whether to show data point markers
     """
-    if not sentiment_counts or sum(sentiment_counts.values()) == 0:
-        st.info("No sentiment data available yet.")
+    if not dates or not mood_scores:
+        st.info("No mood data available yet. Start logging your mood!")
         return
     
-    colors = {
-        "POSITIVE": COLORS["success_green"],
-        "NEGATIVE": COLORS["error_red"],
-        "NEUTRAL": COLORS["accent_teal"],
-        "positive": COLORS["success_green"],
-        "negative": COLORS["error_red"],
-        "neutral": COLORS["accent_teal"],
-    }
+    fig = _build_mood_line_fig(tuple(dates), tuple(mood_scores), title, show_markers)
     
-    labels = list(sentiment_counts.keys())
-    values = list(sentiment_counts.values())
-    chart_colors = [colors.get(label.upper(), COLORS["accent_teal"]) for label in labels]
+    st.plotly_chart(fig, use_container_width=True, config=_CHART_CONFIG)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _build_sentiment_pie_fig(labels: Tuple[str, ...], values: Tuple[int, ...], title: str) -> "go.Figure":
+    """Build the sentiment pie figure; cached so identical inputs skip Plotly validation."""
+    chart_colors = [_SENTIMENT_CHART_COLORS.get(label.upper(), COLORS["accent_teal"]) for label in labels]
     
+    go = _go()
     fig = go.Figure(data=[go.Pie(
         labels=labels,
         values=values,
         hole=0.4,
         marker_colors=chart_colors,
-        textinfo='percent+label',
-        textfont=dict(size=12),
-        hovertemplate='%{label}: %{value} entries<extra></extra>'
+        texttemplate='%{label}<br>%{percent} (%{value})',
+        textfont=dict(size=12)
     )])
     
     fig.update_layout(
-        title=dict(text=title, font=dict(size=16, color=COLORS["charcoal"]), x=0.5),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=50, b=20, l=20, r=20),
+        title=dict(text=title, font=_TITLE_FONT_16, x=0.5),
+        paper_bgcolor=_TRANSPARENT,
+        plot_bgcolor=_TRANSPARENT,
+        margin=_DONUT_MARGIN,
         height=300,
         showlegend=True,
         legend=dict(orientation="h", yanchor="bottom", y=-0.2)
     )
     
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
 
 
-def render_sleep_bar_chart(
-    dates: List[date],
-    sleep_hours: List[float],
-    title: str = "Sleep Patterns"
+@st.fragment
+def render_sentiment_pie_chart(
+    sentiment_counts: dict,
+    title: str = "Sentiment Distribution"
 ) -> None:
     """
-    Render a bar chart showing sleep hours over time.
+    Render a pie chart showing sentiment distribution.
     
     Args:
-        dates: List of dates
-        sleep_hours: List of sleep hours
+        sentiment_counts: Dict with sentiment labels as keys and counts as values
         title: Chart title
     """
-    if not dates or not sleep_hours:
-        st.info("No sleep data available yet.")
+    if not sentiment_counts or sum(sentiment_counts.values()) == 0:
+        st.info("No sentiment data available yet.")
         return
     
-    date_labels = [d.strftime("%b %d") if isinstance(d, (date, datetime)) else str(d) for d in dates]
+    fig = _build_sentiment_pie_fig(
+        tuple(sentiment_counts.keys()),
+        tuple(sentiment_counts.values()),
+        title
+    )
+    
+    st.plotly_chart(fig, use_container_width=True, config=_STATIC_CHART_CONFIG)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _build_sleep_bar_fig(dates: Tuple, sleep_hours: Tuple[float, ...], title: str) -> "go.Figure":
+    """Build the sleep bar figure; cached so identical series skip downsampling and Plotly validation."""
+    dates, sleep_hours = _downsample(dates, sleep_hours)
+    
+    date_labels = _fmt_dates(dates)
     
     # Color bars based on sleep quality
-    colors = []
-    for hours in sleep_hours:
-        if hours < 6:
-            colors.append(COLORS["error_red"])
-        elif hours < 7:
-            colors.append(COLORS["warning_orange"])
-        elif hours <= 9:
-            colors.append(COLORS["success_green"])
-        else:
-            colors.append(COLORS["warning_orange"])
+    buckets = np.digitize(np.asarray(sleep_hours, dtype=float), _SLEEP_BINS)
+    colors = [_SLEEP_PALETTE[i] for i in buckets]
     
+    go = _go()
     fig = go.Figure(data=[go.Bar(
         x=date_labels,
         y=sleep_hours,
@@ -233,18 +347,103 @@ def render_sleep_bar_chart(
                   opacity=0.1, annotation_text="Recommended", annotation_position="right")
     
     fig.update_layout(
-        title=dict(text=title, font=dict(size=16, color=COLORS["charcoal"])),
-        xaxis=dict(title="Date", tickfont=dict(color=COLORS["charcoal"])),
-        yaxis=dict(title="Hours", range=[0, 12], tickfont=dict(color=COLORS["charcoal"])),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=50, b=40, l=40, r=20),
+        title=dict(text=title, font=_TITLE_FONT_16),
+        xaxis=_SLEEP_XAXIS,
+        yaxis=_SLEEP_YAXIS,
+        paper_bgcolor=_TRANSPARENT,
+        plot_bgcolor=_TRANSPARENT,
+        margin=_SLEEP_MARGIN,
         height=300,
     )
     
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
 
 
+@st.fragment
+def render_sleep_bar_chart(
+    dates: List[date],
+    sleep_hours: List[float],
+    title: str = "Sleep Patterns"
+) -> None:
+    """
+    Render a bar chart showing sleep hours over time.
+    
+    Args:
+        dates: List of dates
+        sleep_hours: List of sleep hours
+        title: Chart title
+    """
+    if not dates or not sleep_hours:
+        st.info("No sleep data available yet.")
+        return
+    
+    fig = _build_sleep_bar_fig(tuple(dates), tuple(sleep_hours), title)
+    
+    st.plotly_chart(fig, use_container_width=True, config=_CHART_CONFIG)
+
+
+def render_chart_lazy(label: str, renderer: Callable[..., None], *args, **kwargs) -> None:
+    """
+    Render a below-the-fold chart inside a collapsed expander.
+    
+    The expander tracks its open state, so the renderer (and the Plotly
+    figure behind it) only runs once the user opens it.
+    
+    Args:
+        label: Expander label
+        renderer: Chart render function, e.g. render_sleep_bar_chart
+        *args: Positional arguments passed to the renderer
+        **kwargs: Keyword arguments passed to the renderer
+    """
+    expander = st.expander(label, expanded=False, key=f"lazy_chart_{label}", on_change="rerun")
+    if expander.open:
+        with expander:
+            renderer(*args, **kwargs)
+
+
+# Gauge drawn as a half-circle arc; pathLength="100" lets dash arrays be
+# written directly in score units.
+_GAUGE_ARC = "M 10 50 A 40 40 0 0 1 90 50"
+_GAUGE_STEPS = (
+    (0, 30, 'rgba(102, 187, 106, 0.2)'),
+    (30, 60, 'rgba(255, 167, 38, 0.2)'),
+    (60, 100, 'rgba(239, 83, 80, 0.2)'),
+)
+_GAUGE_STEP_TMPL = (
+    '<path d="{arc}" pathLength="100" fill="none" stroke="{color}" stroke-width="14" '
+    'stroke-dasharray="0 {start} {length} 100"></path>'
+)
+_GAUGE_STEPS_SVG = "".join(
+    _GAUGE_STEP_TMPL.format(arc=_GAUGE_ARC, color=color, start=start, length=end - start)
+    for start, end, color in _GAUGE_STEPS
+)
+
+_GAUGE_SVG_TMPL = """
+<div style="text-align: center;">
+    <div style="font-size: 16px; color: {charcoal};">{title}</div>
+    <svg viewBox="0 0 100 60" width="100%" style="max-width: 320px;">
+        {steps}
+        <path d="{arc}" pathLength="100" fill="none" stroke="{bar_color}" stroke-width="8"
+              stroke-dasharray="{score:.2f} 100"></path>
+        <text x="50" y="48" text-anchor="middle" font-size="16" fill="{charcoal}">{score:.0f}%</text>
+    </svg>
+</div>
+"""
+
+
+def _gauge_svg(risk_score: float, bar_color: str, title: str = "") -> str:
+    """Build the half-circle gauge markup for a 0-100 score."""
+    return _GAUGE_SVG_TMPL.format_map({
+        "arc": _GAUGE_ARC,
+        "steps": _GAUGE_STEPS_SVG,
+        "score": min(max(risk_score, 0.0), 100.0),
+        "bar_color": bar_color,
+        "charcoal": COLORS["charcoal"],
+        "title": title,
+    })
+
+
+@st.fragment
 def render_burnout_gauge(
     risk_score: float,
     title: str = "Burnout Risk"
@@ -264,35 +463,4 @@ def render_burnout_gauge(
     else:
         bar_color = COLORS["error_red"]
     
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=risk_score,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': title, 'font': {'size': 16, 'color': COLORS["charcoal"]}},
-        number={'font': {'size': 40, 'color': COLORS["charcoal"]}, 'suffix': '%'},
-        gauge={
-            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': COLORS["charcoal"]},
-            'bar': {'color': bar_color, 'thickness': 0.75},
-            'bgcolor': COLORS["light_gray"],
-            'borderwidth': 0,
-            'steps': [
-                {'range': [0, 30], 'color': 'rgba(102, 187, 106, 0.2)'},
-                {'range': [30, 60], 'color': 'rgba(255, 167, 38, 0.2)'},
-                {'range': [60, 100], 'color': 'rgba(239, 83, 80, 0.2)'}
-            ],
-            'threshold': {
-                'line': {'color': COLORS["charcoal"], 'width': 2},
-                'thickness': 0.75,
-                'value': risk_score
-            }
-        }
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'color': COLORS["charcoal"]},
-        margin=dict(t=50, b=20, l=30, r=30),
-        height=250
-    )
-    
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    st.markdown(_gauge_svg(risk_score, bar_color, title), unsafe_allow_html=True)
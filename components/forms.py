@@ -1,7 +1,15 @@
 """Reusable form components and helpers."""
 
+import functools
 import streamlit as st
-from typing import List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
+
+
+@functools.lru_cache(maxsize=128)
+def _q_index(option_items: Tuple[Tuple[Any, str], ...]) -> Tuple[List[str], Dict[str, Any]]:
+    """Split questionnaire options into radio labels and a label -> value lookup."""
+    labels = [label for _, label in option_items]
+    return labels, {label: value for value, label in option_items}
 
 
 def render_progress_bar(current_step: int, total_steps: int, labels: Optional[List[str]] = None) -> None:
@@ -141,8 +149,7 @@ def render_questionnaire_question(
     """
     st.markdown(f"**{question_num}. {question_text}**")
     
-    option_labels = list(options.values())
-    option_values = list(options.keys())
+    option_labels, label_to_value = _q_index(tuple(options.items()))
     
     selected_label = st.radio(
         "Select one:",
@@ -153,8 +160,7 @@ def render_questionnaire_question(
     )
     
     if selected_label:
-        selected_index = option_labels.index(selected_label)
-        return option_values[selected_index]
+        return label_to_value[selected_label]
     
     return None
 
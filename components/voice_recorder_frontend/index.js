@@ -0,0 +1,268 @@
+// Minimal Streamlit component protocol (what streamlit-component-lib sends)
+function sendToStreamlit(type, data) {
+    window.parent.postMessage({ isStreamlitMessage: true, type: type, ...data }, '*');
+}
+
+// Speech analysis needs nothing above 8 kHz
+const ANALYSIS_SAMPLE_RATE = 16000;
+
+let mediaRecorder = null;
+let audioChunks = [];
+let isRecording = false;
+let startTime = null;
+let timerInterval = null;
+let stream = null;
+let audioContext = null;
+let sourceNode = null;
+
+const recordBtn = document.getElementById('record-btn');
+const recordIcon = document.getElementById('record-icon');
+const statusDiv = document.getElementById('status');
+const timerDiv = document.getElementById('timer');
+const visualizer = document.getElementById('visualizer');
+
+// Check for browser support
+if (!navigator.mediaDevices || !navigator.mediaDevices.getUserMedia) {
+    statusDiv.textContent = 'Voice recording not supported in this browser';
+    statusDiv.style.color = 'red';
+    recordBtn.disabled = true;
+}
+
+recordBtn.addEventListener('click', async () => {
+    if (!isRecording) {
+        await startRecording();
+    } else {
+        stopRecording();
+    }
+});
+
+async function startRecording() {
+    try {
+        stream = await navigator.mediaDevices.getUserMedia({
+            audio: {
+                echoCancellation: true,
+                noiseSuppression: true,
+                autoGainControl: true,
+                channelCount: 1,
+                sampleRate: ANALYSIS_SAMPLE_RATE
+            }
+        });
+
+        mediaRecorder = new MediaRecorder(stream, {
+            mimeType: 'audio/webm;codecs=opus',
+            audioBitsPerSecond: 24000 // Opus speech-quality target
+        });
+
+        audioChunks = [];
+        isRecording = true;
+
+        mediaRecorder.ondataavailable = (event) => {
+            if (event.data.size > 0) {
+                audioChunks.push(event.data);
+            }
+        };
+
+        mediaRecorder.onstop = async () => {
+            const audioBlob = new Blob(audioChunks, { type: 'audio/webm' });
+
+            try {
+                // Decode the Opus container here; the analysis needs PCM samples.
+                // The 16 kHz capture rate is only a hint, so resample while decoding;
+                // the payload carries the decoded buffer's own rate either way
+                const decoder = new OfflineAudioContext(1, 1, ANALYSIS_SAMPLE_RATE);
+                const decoded = await decoder.decodeAudioData(await audioBlob.arrayBuffer());
+                sendToStreamlit('streamlit:setComponentValue', {
+                    value: encodePcm(decoded),
+                    dataType: 'bytes'
+                });
+            } catch (error) {
+                console.error('Decoding failed:', error);
+                statusDiv.textContent = 'Could not decode the recording: ' + error.message;
+                statusDiv.style.color = 'red';
+            }
+
+            cleanup();
+        };
+
+        // No timeslice: the encoder hands over a single blob on stop()
+        mediaRecorder.start();
+        startTime = Date.now();
+
+        // Update UI
+        recordBtn.classList.add('recording');
+        recordIcon.textContent = '⏹️';
+        statusDiv.textContent = 'Recording...';
+        statusDiv.style.color = '#EF5350';
+        visualizer.style.display = 'block';
+
+        // Start timer
+        timerInterval = setInterval(updateTimer, 1000);
+
+        // One AudioContext per page, shared by every recording's analyser
+        audioContext = audioContext || new (window.AudioContext || window.webkitAudioContext)();
+        await audioContext.resume();
+        sourceNode = audioContext.createMediaStreamSource(stream);
+        const analyser = audioContext.createAnalyser();
+        analyser.fftSize = 64; // 32 bins; the bars are coarse anyway
+        analyser.smoothingTimeConstant = 0.8;
+        sourceNode.connect(analyser);
+
+        // Start visualizer
+        startVisualizer(analyser);
+
+    } catch (error) {
+        console.error('Recording failed:', error);
+        statusDiv.textContent = 'Recording failed: ' + error.message;
+        statusDiv.style.color = 'red';
+    }
+}
+
+function stopRecording() {
+    if (mediaRecorder && isRecording) {
+        mediaRecorder.stop();
+        isRecording = false;
+
+        // Update UI
+        recordBtn.classList.remove('recording');
+        recordIcon.textContent = '🎤';
+        statusDiv.textContent = 'Processing...';
+        statusDiv.style.color = '#FFA726';
+        clearInterval(timerInterval);
+    }
+}
+
+// Payload for Python: the sample rate as a little-endian uint32, then mono float32 samples
+function encodePcm(audioBuffer) {
+    const samples = audioBuffer.getChannelData(0);
+    const payload = new Uint8Array(4 + samples.byteLength);
+    new DataView(payload.buffer).setUint32(0, audioBuffer.sampleRate, true);
+    payload.set(new Uint8Array(samples.buffer, samples.byteOffset, samples.byteLength), 4);
+    return payload;
+}
+
+function updateTimer() {
+    if (startTime) {
+        const elapsed = Math.floor((Date.now() - startTime) / 1000);
+        const minutes = Math.floor(elapsed / 60).toString().padStart(2, '0');
+        const seconds = (elapsed % 60).toString().padStart(2, '0');
+        timerDiv.textContent = `${minutes}:${seconds}`;
+    }
+}
+
+// Draws the frequency bars; shared by the worker and the main-thread fallback
+function createBarPainter(canvas) {
+    const ctx = canvas.getContext('2d');
+
+    // Color stops are static, so one canvas-high gradient serves every bar
+    const gradient = ctx.createLinearGradient(0, 0, 0, canvas.height);
+    gradient.addColorStop(0, '#00897B');
+    gradient.addColorStop(1, '#80CBC4');
+
+    return (data) => {
+        ctx.fillStyle = 'rgb(240, 240, 240)';
+        ctx.fillRect(0, 0, canvas.width, canvas.height);
+
+        const barWidth = (canvas.width / data.length) * 2.5;
+        let x = 0;
+
+        ctx.fillStyle = gradient;
+        for (let i = 0; i < data.length; i++) {
+            const barHeight = (data[i] / 255) * canvas.height;
+            ctx.fillRect(x, canvas.height - barHeight, barWidth, barHeight);
+
+            x += barWidth + 1;
+        }
+    };
+}
+
+// Worker that owns an OffscreenCanvas, keeping drawing off the main thread
+const painterWorkerSrc = `
+    ${createBarPainter.toString()}
+    let paint = null;
+    onmessage = (event) => {
+        if (event.data.canvas) {
+            paint = createBarPainter(event.data.canvas);
+        } else if (paint) {
+            paint(event.data);
+        }
+    };
+`;
+let painterWorker = null;
+
+function createPaint(canvas) {
+    if (!canvas.transferControlToOffscreen || !window.Worker) {
+        return createBarPainter(canvas);
+    }
+
+    const offscreen = canvas.transferControlToOffscreen();
+    const workerUrl = URL.createObjectURL(new Blob([painterWorkerSrc], { type: 'text/javascript' }));
+    painterWorker = new Worker(workerUrl);
+    URL.revokeObjectURL(workerUrl);
+    painterWorker.postMessage({ canvas: offscreen }, [offscreen]);
+
+    // Hand each frame's bins over as a transferable instead of a structured clone
+    return (data) => {
+        const frameData = data.slice();
+        painterWorker.postMessage(frameData, [frameData.buffer]);
+    };
+}
+
+function startVisualizer(analyser) {
+    const canvas = document.createElement('canvas');
+    canvas.width = visualizer.offsetWidth;
+    canvas.height = visualizer.offsetHeight;
+    visualizer.innerHTML = '';
+    visualizer.appendChild(canvas);
+
+    const paint = createPaint(canvas);
+    const dataArray = new Uint8Array(analyser.frequencyBinCount);
+    let frame = 0;
+    let running = false;
+
+    function draw() {
+        // Stop the loop while hidden; visibilitychange restarts it
+        if (!isRecording || document.hidden) {
+            running = false;
+            return;
+        }
+        running = true;
+
+        // Refresh every other frame (~30 fps is plenty for the bars)
+        frame ^= 1;
+        if (frame === 1) {
+            analyser.getByteFrequencyData(dataArray);
+            paint(dataArray);
+        }
+
+        requestAnimationFrame(draw);
+    }
+
+    document.onvisibilitychange = () => {
+        if (!document.hidden && !running) draw();
+    };
+
+    draw();
+}
+
+function cleanup() {
+    if (sourceNode) {
+        sourceNode.disconnect();
+        sourceNode = null;
+    }
+    if (stream) {
+        stream.getTracks().forEach(track => track.stop());
+        stream = null;
+    }
+    if (painterWorker) {
+        painterWorker.terminate();
+        painterWorker = null;
+    }
+    clearInterval(timerInterval);
+    visualizer.style.display = 'none';
+}
+
+// Handle page unload
+window.addEventListener('beforeunload', cleanup);
+
+sendToStreamlit('streamlit:componentReady', { apiVersion: 1 });
+sendToStreamlit('streamlit:setFrameHeight', { height: 300 });
@@ -1,7 +1,14 @@
-"""Application constants including colors, questionnaire data, and scales."""
+"""Application constants including colors, questionnaire data, and scales.
+
+Tables are read-only: mappings are MappingProxyType views and lists are tuples.
+"""
+
+import re
+from types import MappingProxyType
+from typing import Dict, List, Tuple
 
 # Color palette (Mindify theme)
-COLORS = {
+COLORS = MappingProxyType({
     "soft_teal": "#B2DFDB",
     "white": "#FFFFFF",
     "charcoal": "#263238",
@@ -11,10 +18,10 @@ COLORS = {
     "error_red": "#EF5350",
     "warning_orange": "#FFA726",
     "success_green": "#66BB6A",
-}
+})
 
 # Mood scale (1-10)
-MOOD_SCALE = {
+MOOD_SCALE = MappingProxyType({
     1: "Very Low",
     2: "Low",
     3: "Somewhat Low",
@@ -25,19 +32,19 @@ MOOD_SCALE = {
     8: "Very Good",
     9: "Excellent",
     10: "Outstanding",
-}
+})
 
 # Sleep quality scale (1-5)
-SLEEP_QUALITY_SCALE = {
+SLEEP_QUALITY_SCALE = MappingProxyType({
     1: "Very Poor",
     2: "Poor",
     3: "Fair",
     4: "Good",
     5: "Excellent",
-}
+})
 
 # PHQ-9 Questions (Patient Health Questionnaire-9)
-PHQ9_QUESTIONS = [
+PHQ9_QUESTIONS = (
     "Little interest or pleasure in doing things",
     "Feeling down, depressed, or hopeless",
     "Trouble falling or staying asleep, or sleeping too much",
@@ -47,27 +54,33 @@ PHQ9_QUESTIONS = [
     "Trouble concentrating on things, such as reading the newspaper or watching television",
     "Moving or speaking so slowly that other people could have noticed, or the opposite - being so fidgety or restless that you have been moving around a lot more than usual",
     "Thoughts that you would be better off dead, or of hurting yourself in some way",
-]
+)
 
 # PHQ-9 Response options
-PHQ9_OPTIONS = {
+PHQ9_OPTIONS = MappingProxyType({
     0: "Not at all",
     1: "Several days",
     2: "More than half the days",
     3: "Nearly every day",
-}
+})
 
 # PHQ-9 Severity levels
-PHQ9_SEVERITY = {
+PHQ9_SEVERITY = MappingProxyType({
     (0, 4): {"level": "Minimal", "color": COLORS["success_green"], "recommendation": "Continue maintaining your mental wellness routine."},
     (5, 9): {"level": "Mild", "color": COLORS["accent_teal"], "recommendation": "Consider daily mindfulness exercises and monitor your mood."},
     (10, 14): {"level": "Moderate", "color": COLORS["warning_orange"], "recommendation": "Professional consultation recommended. Practice stress-reduction techniques."},
     (15, 19): {"level": "Moderately Severe", "color": COLORS["warning_orange"], "recommendation": "Strongly consider speaking with a mental health professional."},
     (20, 27): {"level": "Severe", "color": COLORS["error_red"], "recommendation": "Please seek professional help. Contact a mental health provider."},
-}
+})
+
+# PHQ-9 severity indexed directly by total score (0-27)
+PHQ9_SEVERITY_BY_SCORE = tuple(
+    next(info for (low, high), info in PHQ9_SEVERITY.items() if low <= score <= high)
+    for score in range(28)
+)
 
 # GAD-7 Questions (Generalized Anxiety Disorder-7)
-GAD7_QUESTIONS = [
+GAD7_QUESTIONS = (
     "Feeling nervous, anxious, or on edge",
     "Not being able to stop or control worrying",
     "Worrying too much about different things",
@@ -75,21 +88,27 @@ GAD7_QUESTIONS = [
     "Being so restless that it's hard to sit still",
     "Becoming easily annoyed or irritable",
     "Feeling afraid as if something awful might happen",
-]
+)
 
 # GAD-7 Response options (same as PHQ-9)
 GAD7_OPTIONS = PHQ9_OPTIONS
 
 # GAD-7 Severity levels
-GAD7_SEVERITY = {
+GAD7_SEVERITY = MappingProxyType({
     (0, 4): {"level": "Minimal", "color": COLORS["success_green"], "recommendation": "Your anxiety levels are within normal range. Keep up healthy habits."},
     (5, 9): {"level": "Mild", "color": COLORS["accent_teal"], "recommendation": "Practice breathing exercises and consider journaling your thoughts."},
     (10, 14): {"level": "Moderate", "color": COLORS["warning_orange"], "recommendation": "Consider speaking with a counselor. Implement daily relaxation techniques."},
     (15, 21): {"level": "Severe", "color": COLORS["error_red"], "recommendation": "Professional support is recommended. Please consult a mental health provider."},
-}
+})
+
+# GAD-7 severity indexed directly by total score (0-21)
+GAD7_SEVERITY_BY_SCORE = tuple(
+    next(info for (low, high), info in GAD7_SEVERITY.items() if low <= score <= high)
+    for score in range(22)
+)
 
 # Health goals options
-HEALTH_GOALS = [
+HEALTH_GOALS = (
     "Reduce anxiety",
     "Manage depression symptoms",
     "Improve sleep quality",
@@ -98,10 +117,10 @@ HEALTH_GOALS = [
     "Track mood patterns",
     "Develop coping strategies",
     "Maintain work-life balance",
-]
+)
 
 # Profession categories
-PROFESSION_CATEGORIES = [
+PROFESSION_CATEGORIES = (
     "Student",
     "Healthcare Professional",
     "Technology/IT",
@@ -112,50 +131,87 @@ PROFESSION_CATEGORIES = [
     "Self-employed",
     "Retired",
     "Other",
-]
+)
 
 # Burnout risk thresholds
-BURNOUT_THRESHOLDS = {
+BURNOUT_THRESHOLDS = MappingProxyType({
     "low": {"max_score": 30, "color": COLORS["success_green"], "message": "Low burnout risk"},
     "medium": {"max_score": 60, "color": COLORS["warning_orange"], "message": "Moderate burnout risk - consider taking breaks"},
     "high": {"max_score": 100, "color": COLORS["error_red"], "message": "High burnout risk - prioritize self-care"},
-}
+})
 
 # Voice analysis thresholds
-VOICE_TENSION_THRESHOLDS = {
+VOICE_TENSION_THRESHOLDS = MappingProxyType({
     "relaxed": {"max": 30, "label": "Relaxed"},
     "normal": {"max": 50, "label": "Normal"},
     "mild_stress": {"max": 70, "label": "Mild Stress"},
     "high_stress": {"max": 100, "label": "High Stress"},
-}
+})
 
 # Sentiment labels
-SENTIMENT_LABELS = {
+SENTIMENT_LABELS = MappingProxyType({
     "POSITIVE": {"color": COLORS["success_green"], "icon": "smile"},
     "NEGATIVE": {"color": COLORS["error_red"], "icon": "frown"},
     "NEUTRAL": {"color": COLORS["accent_teal"], "icon": "meh"},
-}
+})
 
 # Cognitive distortion patterns
-COGNITIVE_DISTORTIONS = {
+COGNITIVE_DISTORTIONS = MappingProxyType({
     "catastrophizing": {
-        "patterns": ["worst", "terrible", "disaster", "ruined", "end of the world", "never recover"],
+        "patterns": ("worst", "terrible", "disaster", "ruined", "end of the world", "never recover"),
         "description": "Expecting the worst possible outcome",
     },
     "black_and_white": {
-        "patterns": ["always", "never", "everyone", "no one", "everything", "nothing"],
+        "patterns": ("always", "never", "everyone", "no one", "everything", "nothing"),
         "description": "All-or-nothing thinking",
     },
     "mind_reading": {
-        "patterns": ["they think", "they must think", "everyone thinks", "they probably think"],
+        "patterns": ("they think", "they must think", "everyone thinks", "they probably think"),
         "description": "Assuming you know what others are thinking",
     },
     "should_statements": {
-        "patterns": ["should have", "must have", "ought to", "have to"],
+        "patterns": ("should have", "must have", "ought to", "have to"),
         "description": "Using 'should' statements to criticize yourself or others",
     },
     "overgeneralization": {
-        "patterns": ["this always happens", "i never", "every time", "nothing ever"],
+        "patterns": ("this always happens", "i never", "every time", "nothing ever"),
         "description": "Drawing broad conclusions from a single event",
     },
-}
+})
+
+
+def get_phq9_severity(score: int) -> Dict:
+    """Get PHQ-9 severity info for a total score (out-of-range scores are clamped)."""
+    return PHQ9_SEVERITY_BY_SCORE[min(max(score, 0), 27)]
+
+
+def get_gad7_severity(score: int) -> Dict:
+    """Get GAD-7 severity info for a total score (out-of-range scores are clamped)."""
+    return GAD7_SEVERITY_BY_SCORE[min(max(score, 0), 21)]
+
+
+# One compiled word-bounded alternation per distortion, built once at import.
+# Categories keep separate patterns because they overlap ("never" / "i never").
+_DISTORTION_REGEXES = tuple(
+    (name, re.compile(r"\b(?:" + "|".join(map(re.escape, data["patterns"])) + r")\b"))
+    for name, data in COGNITIVE_DISTORTIONS.items()
+)
+
+
+def scan_distortions(text: str) -> List[Tuple[str, str]]:
+    """
+    Find cognitive distortion categories present in text.
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        List of (distortion name, matched pattern), one per category found
+    """
+    text_lower = text.lower()
+    found = []
+    for name, regex in _DISTORTION_REGEXES:
+        match = regex.search(text_lower)
+        if match:
+            found.append((name, match.group(0)))
+    return found
@@ -1,11 +1,13 @@
 """Application settings and configuration loader."""
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (deployments with real env vars can opt out)
+if not os.getenv("DISABLE_DOTENV"):
+    load_dotenv()
 
 
 class Settings:
@@ -28,12 +30,26 @@ class Settings:
         self.MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR") or None
         
         # Debug mode
-        self.DEBUG = os.getenv("DEBUG", "True").lower() == "true"
+        self.DEBUG = os.getenv("DEBUG", "False").lower() == "true"
         
-        # Application paths
-        self.BASE_DIR = Path(__file__).parent.parent
-        self.STATIC_DIR = self.BASE_DIR / "static"
-        self.DATABASE_DIR = self.BASE_DIR
+        # Log every SQL statement (only when explicitly requested)
+        self.SQL_ECHO = os.getenv("SQL_ECHO") == "1"
+    
+    # Application paths (resolved on first access)
+    @cached_property
+    def BASE_DIR(self) -> Path:
+        """Project root directory."""
+        return Path(__file__).parent.parent
+    
+    @cached_property
+    def STATIC_DIR(self) -> Path:
+        """Static assets directory."""
+        return self.BASE_DIR / "static"
+    
+    @cached_property
+    def DATABASE_DIR(self) -> Path:
+        """Directory holding the SQLite database file."""
+        return self.BASE_DIR
         
     @property
     def is_sqlite(self) -> bool:
@@ -46,5 +62,11 @@ class Settings:
         return self.DATABASE_URL.startswith("postgresql")
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings instance."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -2,28 +2,66 @@
 
 from contextlib import contextmanager
 from typing import Generator
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 
 from config.settings import settings
 
+# JSON column (de)serialization; orjson is C-accelerated when installed
+try:
+    import orjson
 
-# Create engine with appropriate settings
+    def _json_serializer(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_deserializer = orjson.loads
+except ImportError:
+    import json
+
+    _json_serializer = json.dumps
+    _json_deserializer = json.loads
+
+
+# Create engine with appropriate settings; dialect_insert is the matching
+# INSERT construct with on_conflict_do_update() for single-statement upserts
 if settings.is_sqlite:
     # SQLite specific settings
+    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False},  # Required for SQLite with threads
-        echo=settings.DEBUG,
+        echo=settings.SQL_ECHO,
+        query_cache_size=1200,  # Room for every compiled ORM query the pages issue
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer,
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune each new SQLite connection: WAL so reads don't block on writes, mmap'd reads."""
+        cursor = dbapi_connection.cursor()
+        cursor.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"
+        )
+        cursor.close()
 else:
     # PostgreSQL settings with connection pooling
+    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
     engine = create_engine(
         settings.DATABASE_URL,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=20,  # Sized for many concurrent Streamlit sessions
+        max_overflow=40,
+        pool_recycle=1800,  # Retire connections before managed-PG idle timeouts drop them
         pool_pre_ping=True,  # Verify connections before use
-        echo=settings.DEBUG,
+        echo=settings.SQL_ECHO,
+        query_cache_size=1200,  # Room for every compiled ORM query the pages issue
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer,
     )
 
 # Session factory
@@ -31,10 +69,14 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @contextmanager
-def get_session() -> Generator[Session, None, None]:
+def get_session(readonly: bool = False) -> Generator[Session, None, None]:
     """
     Context manager for database sessions.
     
+    Args:
+        readonly: Skip the COMMIT on exit for sessions that only read;
+            the transaction is simply released when the session closes
+    
     Usage:
         with get_session() as session:
             user = session.query(User).first()
@@ -42,7 +84,8 @@ def get_session() -> Generator[Session, None, None]:
     session = SessionLocal()
     try:
         yield session
-        session.commit()
+        if not readonly:
+            session.commit()
     except Exception:
         session.rollback()
         raise
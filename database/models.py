@@ -4,10 +4,14 @@ from datetime import datetime, date
 from typing import Optional, List
 from sqlalchemy import (
     Column, Integer, String, Text, Float, Date, DateTime, 
-    ForeignKey, UniqueConstraint, Index, JSON
+    ForeignKey, UniqueConstraint, Index, JSON, func
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, DeclarativeBase, Mapped, mapped_column
 
+# JSON column type; binary JSONB on PostgreSQL so it can be GIN-indexed
+JSONList = JSON().with_variant(JSONB(), "postgresql")
+
 
 class Base(DeclarativeBase):
     """Base class for all models."""
@@ -22,7 +26,7 @@ class User(Base):
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
     hashed_password: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationships
     profile: Mapped[Optional["UserProfile"]] = relationship(
@@ -49,9 +53,9 @@ class UserProfile(Base):
     profession: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     sleep_hours: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     sleep_quality: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 1-5 scale
-    health_goals: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string list
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    health_goals: Mapped[Optional[list]] = mapped_column(JSONList, nullable=True)  # list of goal strings
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationship
     user: Mapped["User"] = relationship("User", back_populates="profile")
@@ -71,8 +75,8 @@ class HealthBaseline(Base):
     gad7_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     gad7_severity: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     last_test_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationship
     user: Mapped["User"] = relationship("User", back_populates="health_baseline")
@@ -86,7 +90,6 @@ class DailyLog(Base):
     __tablename__ = "daily_logs"
     __table_args__ = (
         UniqueConstraint("user_id", "log_date", name="unique_user_date"),
-        Index("idx_user_date", "user_id", "log_date"),
     )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -97,13 +100,39 @@ class DailyLog(Base):
     ai_sentiment: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     ai_sentiment_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     ai_emotion: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
-    cognitive_distortions: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string list
+    cognitive_distortions: Mapped[Optional[list]] = mapped_column(JSONList, nullable=True)  # list of distortion dicts
     vocal_tension: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 0-100 scale
     sleep_hours: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationship
     user: Mapped["User"] = relationship("User", back_populates="daily_logs")
     
     def __repr__(self):
         return f"<DailyLog(user_id={self.user_id}, date={self.log_date}, mood={self.mood_score})>"
+
+
+# Newest-first per user, matching the dashboard's "latest N logs" queries.
+# On PostgreSQL the index also covers mood and sentiment for index-only scans.
+Index(
+    "idx_user_date",
+    DailyLog.user_id,
+    DailyLog.log_date.desc(),
+    postgresql_include=["mood_score", "ai_sentiment"],
+)
+
+# "Past journal entries" list: newest-first, skipping mood-only days
+Index(
+    "idx_daily_logs_journal",
+    DailyLog.user_id,
+    DailyLog.log_date.desc(),
+    postgresql_where=DailyLog.journal_text.isnot(None),
+    sqlite_where=DailyLog.journal_text.isnot(None),
+)
+
+# Containment queries on detected distortions (PostgreSQL only)
+Index(
+    "idx_daily_logs_distortions",
+    DailyLog.cognitive_distortions,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
@@ -1,7 +1,9 @@
 """Authentication page with login and signup functionality."""
 
 import streamlit as st
-from services.auth_service import create_user, authenticate_user
+from services.auth_service import (
+    create_user, authenticate_user, get_onboarding_status
+)
 from utils.session_manager import set_user, set_page
 from utils.validators import validate_email, validate_password_strength, validate_username
 
@@ -64,11 +66,10 @@ def _render_login_form():
                     set_user(user_id, username)
                     st.success(message)
                     # Check if user needs to complete onboarding
-                    from services.auth_service import has_completed_onboarding, has_completed_assessment
-                    
-                    if not has_completed_onboarding(user_id):
+                    onboarded, assessed = get_onboarding_status(user_id)
+                    if not onboarded:
                         set_page("onboarding")
-                    elif not has_completed_assessment(user_id):
+                    elif not assessed:
                         set_page("clinical")
                     else:
                         set_page("dashboard")
@@ -121,30 +122,23 @@ def _render_signup_form():
             # Validation
             errors = []
             
-            if not username or not email or not password or not confirm_password:
+            # Stop at the first failing check so later regexes don't run
+            if not all((username, email, password, confirm_password)):
                 errors.append("Please fill in all fields")
             else:
-                # Validate username
                 username_valid, username_msg = validate_username(username)
                 if not username_valid:
                     errors.append(username_msg)
-                
-                # Validate email
-                if not validate_email(email):
+                elif not validate_email(email):
                     errors.append("Please enter a valid email address")
-                
-                # Validate password
-                password_valid, password_msg = validate_password_strength(password)
-                if not password_valid:
-                    errors.append(password_msg)
-                
-                # Check password match
-                if password != confirm_password:
-                    errors.append("Passwords do not match")
-                
-                # Check terms agreement
-                if not agree_terms:
-                    errors.append("Please agree to the Terms of Service")
+                else:
+                    password_valid, password_msg = validate_password_strength(password)
+                    if not password_valid:
+                        errors.append(password_msg)
+                    elif password != confirm_password:
+                        errors.append("Passwords do not match")
+                    elif not agree_terms:
+                        errors.append("Please agree to the Terms of Service")
             
             if errors:
                 for error in errors:
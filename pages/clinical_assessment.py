@@ -2,17 +2,27 @@
 
 import streamlit as st
 from datetime import date
-from database.connection import get_session
+from sqlalchemy import func
+from database.connection import dialect_insert, get_session
 from database.models import HealthBaseline
+from services.auth_service import invalidate_onboarding_status
 from utils.session_manager import get_user_id, set_page
 from config.constants import (
-    PHQ9_QUESTIONS, PHQ9_OPTIONS, PHQ9_SEVERITY,
-    GAD7_QUESTIONS, GAD7_OPTIONS, GAD7_SEVERITY,
-    COLORS
+    PHQ9_QUESTIONS, PHQ9_OPTIONS,
+    GAD7_QUESTIONS, GAD7_OPTIONS,
+    COLORS, get_phq9_severity, get_gad7_severity
 )
 from components.charts import render_donut_chart
 from components.cards import render_recommendation_card
 
+# Radio labels, score keys and the label -> score lookup, built once at import
+_PHQ9_KEYS = tuple(PHQ9_OPTIONS.keys())
+_PHQ9_VALUES = tuple(PHQ9_OPTIONS.values())
+_PHQ9_VAL2KEY = dict(zip(_PHQ9_VALUES, _PHQ9_KEYS))
+_GAD7_KEYS = tuple(GAD7_OPTIONS.keys())
+_GAD7_VALUES = tuple(GAD7_OPTIONS.values())
+_GAD7_VAL2KEY = dict(zip(_GAD7_VALUES, _GAD7_KEYS))
+
 
 def render():
     """Render the clinical assessment page."""
@@ -22,8 +32,13 @@ def render():
         st.rerun()
         return
     
+    ss = st.session_state
+    ss.setdefault("assessment_data", {})
+    ss.setdefault("assessment_results", {})
+    ss.setdefault("show_assessment_results", False)
+    
     # Check if showing results
-    if st.session_state.get("show_assessment_results", False):
+    if ss.show_assessment_results:
         _render_results()
         return
     
@@ -37,10 +52,11 @@ def render():
     # Assessment tabs
     tab1, tab2 = st.tabs(["Depression Screening (PHQ-9)", "Anxiety Screening (GAD-7)"])
     
-    with tab1:
+    # Keyed containers pick up the question divider rule in styles.css
+    with tab1, st.container(key="assessment-phq9"):
         _render_phq9()
     
-    with tab2:
+    with tab2, st.container(key="assessment-gad7"):
         _render_gad7()
     
     st.markdown("<br>", unsafe_allow_html=True)
@@ -56,20 +72,19 @@ def _render_phq9():
     """Render PHQ-9 questionnaire."""
     st.markdown("### Over the last 2 weeks, how often have you been bothered by:")
     
-    assessment_data = st.session_state.get("assessment_data", {})
-    phq9_responses = assessment_data.get("phq9", {})
+    assessment_data = st.session_state.assessment_data
+    phq9_responses = assessment_data.setdefault("phq9", {})
+    phq9_score = 0
     
     for i, question in enumerate(PHQ9_QUESTIONS, 1):
         st.markdown(f"**{i}. {question}**")
         
         key = f"phq9_q{i}"
-        options = list(PHQ9_OPTIONS.values())
+        options = _PHQ9_VALUES
         
         # Get previous selection
         prev_value = phq9_responses.get(key)
-        default_index = 0
-        if prev_value is not None:
-            default_index = list(PHQ9_OPTIONS.keys()).index(prev_value)
+        default_index = _PHQ9_KEYS.index(prev_value) if prev_value is not None else 0
         
         selected = st.radio(
             f"Question {i}",
@@ -81,34 +96,31 @@ def _render_phq9():
         )
         
         # Store the value
-        selected_value = list(PHQ9_OPTIONS.keys())[options.index(selected)]
+        selected_value = _PHQ9_VAL2KEY[selected]
         phq9_responses[key] = selected_value
-        
-        st.markdown("<hr style='margin: 0.5rem 0;'>", unsafe_allow_html=True)
+        phq9_score += selected_value
     
-    # Update session state
-    assessment_data["phq9"] = phq9_responses
-    st.session_state.assessment_data = assessment_data
+    # Responses were updated in place; store the running total alongside them
+    assessment_data["phq9_score"] = phq9_score
 
 
 def _render_gad7():
     """Render GAD-7 questionnaire."""
     st.markdown("### Over the last 2 weeks, how often have you been bothered by:")
     
-    assessment_data = st.session_state.get("assessment_data", {})
-    gad7_responses = assessment_data.get("gad7", {})
+    assessment_data = st.session_state.assessment_data
+    gad7_responses = assessment_data.setdefault("gad7", {})
+    gad7_score = 0
     
     for i, question in enumerate(GAD7_QUESTIONS, 1):
         st.markdown(f"**{i}. {question}**")
         
         key = f"gad7_q{i}"
-        options = list(GAD7_OPTIONS.values())
+        options = _GAD7_VALUES
         
         # Get previous selection
         prev_value = gad7_responses.get(key)
-        default_index = 0
-        if prev_value is not None:
-            default_index = list(GAD7_OPTIONS.keys()).index(prev_value)
+        default_index = _GAD7_KEYS.index(prev_value) if prev_value is not None else 0
         
         selected = st.radio(
             f"Question {i}",
@@ -120,30 +132,25 @@ def _render_gad7():
         )
         
         # Store the value
-        selected_value = list(GAD7_OPTIONS.keys())[options.index(selected)]
+        selected_value = _GAD7_VAL2KEY[selected]
         gad7_responses[key] = selected_value
-        
-        st.markdown("<hr style='margin: 0.5rem 0;'>", unsafe_allow_html=True)
+        gad7_score += selected_value
     
-    # Update session state
-    assessment_data["gad7"] = gad7_responses
-    st.session_state.assessment_data = assessment_data
+    # Responses were updated in place; store the running total alongside them
+    assessment_data["gad7_score"] = gad7_score
 
 
 def _process_assessment():
     """Process and save the assessment results."""
     user_id = get_user_id()
-    assessment_data = st.session_state.get("assessment_data", {})
+    assessment_data = st.session_state.assessment_data
     
-    # Calculate PHQ-9 score
-    phq9_responses = assessment_data.get("phq9", {})
-    phq9_score = sum(phq9_responses.values()) if phq9_responses else 0
-    phq9_severity = _get_severity_level(phq9_score, PHQ9_SEVERITY)
+    # Scores are totalled while the questionnaires render
+    phq9_score = assessment_data.get("phq9_score", 0)
+    phq9_severity = get_phq9_severity(phq9_score)
     
-    # Calculate GAD-7 score
-    gad7_responses = assessment_data.get("gad7", {})
-    gad7_score = sum(gad7_responses.values()) if gad7_responses else 0
-    gad7_severity = _get_severity_level(gad7_score, GAD7_SEVERITY)
+    gad7_score = assessment_data.get("gad7_score", 0)
+    gad7_severity = get_gad7_severity(gad7_score)
     
     # Store results in session for display
     st.session_state.assessment_results = {
@@ -155,27 +162,24 @@ def _process_assessment():
     
     # Save to database
     try:
+        values = {
+            "phq9_score": phq9_score,
+            "phq9_severity": phq9_severity["level"],
+            "gad7_score": gad7_score,
+            "gad7_severity": gad7_severity["level"],
+            "last_test_date": date.today(),
+        }
+        # One statement keyed on the unique user_id instead of SELECT then INSERT/UPDATE
+        stmt = dialect_insert(HealthBaseline).values(user_id=user_id, **values)
+        # set_ bypasses Column.onupdate, so refresh updated_at explicitly
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={**values, "updated_at": func.now()}
+        )
+        
         with get_session() as session:
-            baseline = session.query(HealthBaseline).filter(
-                HealthBaseline.user_id == user_id
-            ).first()
-            
-            if baseline:
-                baseline.phq9_score = phq9_score
-                baseline.phq9_severity = phq9_severity["level"]
-                baseline.gad7_score = gad7_score
-                baseline.gad7_severity = gad7_severity["level"]
-                baseline.last_test_date = date.today()
-            else:
-                baseline = HealthBaseline(
-                    user_id=user_id,
-                    phq9_score=phq9_score,
-                    phq9_severity=phq9_severity["level"],
-                    gad7_score=gad7_score,
-                    gad7_severity=gad7_severity["level"],
-                    last_test_date=date.today()
-                )
-                session.add(baseline)
+            session.execute(stmt)
+        invalidate_onboarding_status(user_id)
         
         st.session_state.show_assessment_results = True
         st.rerun()
@@ -184,17 +188,9 @@ def _process_assessment():
         st.error(f"Error saving assessment: {str(e)}")
 
 
-def _get_severity_level(score: int, severity_dict: dict) -> dict:
-    """Get severity level info based on score."""
-    for (min_score, max_score), info in severity_dict.items():
-        if min_score <= score <= max_score:
-            return info
-    return list(severity_dict.values())[-1]  # Return highest severity if not found
-
-
 def _render_results():
     """Render assessment results page."""
-    results = st.session_state.get("assessment_results", {})
+    results = st.session_state.assessment_results
     
     st.markdown("""
         <div style="text-align: center; margin-bottom: 2rem;">
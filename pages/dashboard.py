@@ -1,29 +1,56 @@
 """Dashboard page with mood tracking, analytics, and journal functionality."""
 
+import hashlib
 import streamlit as st
 from datetime import datetime, date
-from services.analytics_service import get_user_analytics, calculate_burnout_risk, get_weekly_report
-from services.ai_service import analyze_sentiment, generate_journal_insights
-from services.voice_service import analyze_voice_tension, get_tension_interpretation
+from services.analytics_service import (
+    cached_user_analytics, cached_burnout_risk, cached_weekly_report, invalidate_user_cache
+)
 from components.cards import glass_card
-from components.charts import create_mood_chart, create_donut_chart
+from components.charts import render_mood_line_chart
 from components.voice_recorder import render_voice_recorder
-from database.connection import get_session
+from database.connection import dialect_insert, get_session
 from database.models import DailyLog
+from sqlalchemy.orm import load_only
 from config.constants import MOOD_SCALE, COLORS
 
 
+# Big mood score display, filled with str.format
+_MOOD_HTML_TEMPLATE = """
+    <div style="text-align: center; padding: 2rem;">
+        <div class="mood-score">{score}/10</div>
+        <div class="mood-score-label">
+            {label}
+        </div>
+    </div>
+"""
+
+# Past-entry sentiment line, filled with str.format
+_SENTIMENT_COLORS = {'POSITIVE': 'green', 'NEGATIVE': 'red', 'NEUTRAL': 'blue'}
+_SENTIMENT_HTML = "**Sentiment:** <span style='color:{c}'>{s}</span>"
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_voice_analysis(audio_hash: str, sample_rate: int, _pcm_bytes: bytes) -> dict:
+    """Cached analyze_voice_tension, keyed on the audio digest and rate (the bytes aren't hashed)."""
+    from services.voice_service import analyze_voice_tension
+    return analyze_voice_tension(_pcm_bytes, sample_rate)
+
+
 def render():
     """Render the main dashboard page."""
     st.markdown("## 🧠 MindfulMe Dashboard")
 
+    ss = st.session_state
+    ss.setdefault("show_entries", False)
+
     # Get user analytics
-    user_id = st.session_state.get('user_id')
+    user_id = ss.get('user_id')
     if not user_id:
         st.error("User not authenticated")
         return
 
-    analytics = get_user_analytics(user_id)
+    analytics = cached_user_analytics(user_id)
 
     # Main dashboard layout
     col1, col2 = st.columns([2, 1])
@@ -43,6 +70,16 @@ def render():
         render_voice_section(user_id)
 
 
+def _update_mood(user_id: int, analytics: dict):
+    """Save the slider's mood for today (Update Mood callback)."""
+    mood_value = st.session_state.today_mood
+    save_mood_entry(user_id, date.today(), mood_value)
+    # Fragment reruns reuse the caller's arguments, so keep the display in step
+    analytics['current_mood'] = mood_value
+    st.toast("Mood updated!")
+
+
+@st.fragment
 def render_mood_tracking(user_id: int, analytics: dict):
     """Render mood tracking section."""
     with glass_card("Today's Mood & Analytics"):
@@ -52,18 +89,11 @@ def render_mood_tracking(user_id: int, analytics: dict):
         col1, col2, col3 = st.columns([1, 2, 1])
 
         with col2:
-            st.markdown(f"""
-                <div style="text-align: center; padding: 2rem;">
-                    <div class="mood-score">{current_mood}/10</div>
-                    <div class="mood-score-label">
-                        {MOOD_SCALE.get(current_mood, 'Unknown')}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+            label = MOOD_SCALE.get(current_mood, 'Unknown')
+            st.markdown(_MOOD_HTML_TEMPLATE.format(score=current_mood, label=label), unsafe_allow_html=True)
 
         # Mood slider for today
-        today = date.today()
-        mood_value = st.slider(
+        st.slider(
             "How are you feeling today?",
             min_value=1,
             max_value=10,
@@ -71,20 +101,27 @@ def render_mood_tracking(user_id: int, analytics: dict):
             key="today_mood"
         )
 
-        if st.button("Update Mood", key="update_mood"):
-            save_mood_entry(user_id, today, mood_value)
-            st.success("Mood updated!")
-            st.rerun()
+        # The callback saves before the click's rerun, so the display above
+        # shows the new mood in that same run without a second st.rerun()
+        st.button("Update Mood", key="update_mood", on_click=_update_mood, args=(user_id, analytics))
 
         # Weekly mood chart
         if analytics.get('mood_trend'):
             st.markdown("### Mood Trend (Last 30 Days)")
             mood_data = analytics['mood_trend']
-            create_mood_chart(mood_data)
+            render_mood_line_chart(
+                [point['date'] for point in mood_data],
+                [point['mood'] for point in mood_data],
+                title=""
+            )
 
 
+@st.fragment
 def render_journal_section(user_id: int):
     """Render journal entry section."""
+    # Imported here so pages that never show the dashboard skip the AI service
+    from services.ai_service import generate_journal_insights
+
     with glass_card("Daily Journal"):
         # Journal input
         journal_text = st.text_area(
@@ -99,29 +136,29 @@ def render_journal_section(user_id: int):
         with col1:
             if st.button("Save Journal Entry", key="save_journal"):
                 if journal_text.strip():
-                    save_journal_entry(user_id, journal_text)
+                    # Analyze once; the same insights are stored and shown
+                    insights = generate_journal_insights(journal_text)
+                    save_journal_entry(user_id, journal_text, insights)
                     st.success("Journal entry saved!")
 
                     # Show AI insights
-                    insights = generate_journal_insights(journal_text)
                     display_journal_insights(insights)
                 else:
                     st.warning("Please write something in your journal.")
 
         with col2:
             if st.button("View Past Entries", key="view_entries"):
-                st.session_state.show_entries = not st.session_state.get('show_entries', False)
-                st.rerun()
+                st.session_state.show_entries = not st.session_state.show_entries
 
         # Show past entries if requested
-        if st.session_state.get('show_entries', False):
+        if st.session_state.show_entries:
             display_recent_entries(user_id)
 
 
 def render_analytics_sidebar(analytics: dict, user_id: int):
     """Render analytics sidebar."""
     # Burnout indicator
-    burnout_score = calculate_burnout_risk(user_id)
+    burnout_score = cached_burnout_risk(user_id)
 
     with glass_card("Burnout Risk Indicator"):
         if burnout_score <= 30:
@@ -151,7 +188,7 @@ def render_analytics_sidebar(analytics: dict, user_id: int):
 
     # Weekly report
     with glass_card("Weekly Report"):
-        report = get_weekly_report(user_id)
+        report = cached_weekly_report(user_id)
 
         st.markdown(f"**{report['mood_summary']['level']}**")
         st.write(report['mood_summary']['message'])
@@ -167,18 +204,25 @@ def render_analytics_sidebar(analytics: dict, user_id: int):
                 st.write(f"• {rec}")
 
 
+@st.fragment
 def render_voice_section(user_id: int):
     """Render voice recording section."""
+    # Imported here so pages that never show the dashboard skip numpy/librosa setup
+    from services.voice_service import get_tension_interpretation, generate_voice_recommendations
+
     with glass_card("Voice Analysis"):
         st.markdown("Record your voice to analyze stress levels:")
 
         # Voice recorder component
-        audio_data = render_voice_recorder()
+        recording = render_voice_recorder()
 
-        if audio_data:
-            # Analyze the recorded audio
+        if recording:
+            pcm_bytes, sample_rate = recording
+
+            # Analyze the recorded audio at the rate it was captured
             with st.spinner("Analyzing voice..."):
-                analysis = analyze_voice_tension(audio_data)
+                audio_hash = hashlib.blake2b(pcm_bytes, digest_size=16).hexdigest()
+                analysis = _cached_voice_analysis(audio_hash, sample_rate, pcm_bytes)
 
                 if analysis['analysis_successful']:
                     tension_score = analysis['tension_score']
@@ -194,7 +238,6 @@ def render_voice_section(user_id: int):
                     st.progress(tension_score / 100)
 
                     # Recommendations
-                    from services.voice_service import generate_voice_recommendations
                     recommendations = generate_voice_recommendations(tension_score)
 
                     if recommendations:
@@ -205,68 +248,37 @@ def render_voice_section(user_id: int):
                     st.error(f"Analysis failed: {analysis.get('error', 'Unknown error')}")
 
 
-def save_mood_entry(user_id: int, entry_date: date, mood_score: int):
-    """Save mood entry to database."""
-    with get_session() as session:
-        # Check if entry already exists for today
-        existing = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id,
-            DailyLog.log_date == entry_date
-        ).first()
+def _upsert_daily_log(user_id: int, log_date: date, **values):
+    """Insert or update one user's log for a day, then refresh the user's analytics."""
+    stmt = dialect_insert(DailyLog).values(user_id=user_id, log_date=log_date, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=["user_id", "log_date"], set_=values)
 
-        if existing:
-            existing.mood_score = mood_score
-        else:
-            new_entry = DailyLog(
-                user_id=user_id,
-                log_date=entry_date,
-                mood_score=mood_score
-            )
-            session.add(new_entry)
+    # Commits on exit; errors propagate, so callers only report success once it lands
+    with get_session() as session:
+        session.execute(stmt)
 
+    invalidate_user_cache(user_id)
 
-def save_journal_entry(user_id: int, journal_text: str):
-    """Save journal entry with AI analysis."""
-    # Analyze sentiment and emotion
-    sentiment, confidence = analyze_sentiment(journal_text)
-    emotion = generate_journal_insights(journal_text)['emotion']
 
-    today = date.today()
+def save_mood_entry(user_id: int, entry_date: date, mood_score: int):
+    """Save mood entry to database."""
+    _upsert_daily_log(user_id, entry_date, mood_score=mood_score)
 
-    with get_session() as session:
-        # Check if entry already exists for today
-        existing = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id,
-            DailyLog.log_date == today
-        ).first()
 
-        if existing:
-            existing.journal_text = journal_text
-            existing.ai_sentiment = sentiment
-            existing.ai_emotion = emotion
-        else:
-            new_entry = DailyLog(
-                user_id=user_id,
-                log_date=today,
-                journal_text=journal_text,
-                ai_sentiment=sentiment,
-                ai_emotion=emotion
-            )
-            session.add(new_entry)
+def save_journal_entry(user_id: int, journal_text: str, insights: dict):
+    """Save journal entry with AI analysis from generate_journal_insights."""
+    _upsert_daily_log(
+        user_id,
+        date.today(),
+        journal_text=journal_text,
+        ai_sentiment=insights['sentiment'],
+        ai_emotion=insights['emotion']
+    )
 
 
 def save_voice_analysis(user_id: int, tension_score: float, analysis: dict):
     """Save voice analysis results."""
-    today = date.today()
-
-    with get_session() as session:
-        existing = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id,
-            DailyLog.log_date == today
-        ).first()
-
-        if existing:
-            existing.vocal_tension = tension_score
+    _upsert_daily_log(user_id, date.today(), vocal_tension=tension_score)
 
 
 def display_journal_insights(insights: dict):
@@ -312,28 +324,34 @@ def display_journal_insights(insights: dict):
 
 def display_recent_entries(user_id: int, limit: int = 5):
     """Display recent journal entries."""
-    with get_session() as session:
-        entries = session.query(DailyLog).filter(
+    found = False
+
+    with get_session(readonly=True) as session:
+        # Only the columns shown below; rows are rendered as they stream in
+        entries = session.query(DailyLog).options(
+            load_only(
+                DailyLog.log_date,
+                DailyLog.mood_score,
+                DailyLog.journal_text,
+                DailyLog.ai_sentiment,
+                DailyLog.ai_emotion
+            )
+        ).filter(
             DailyLog.user_id == user_id,
             DailyLog.journal_text.isnot(None)
-        ).order_by(DailyLog.log_date.desc()).limit(limit).all()
+        ).order_by(DailyLog.log_date.desc()).limit(limit).yield_per(limit)
 
-    if not entries:
-        st.info("No journal entries found.")
-        return
+        for entry in entries:
+            found = True
+            with st.expander(f"{entry.log_date.strftime('%B %d, %Y')} - Mood: {entry.mood_score}/10"):
+                st.write(entry.journal_text)
 
-    for entry in entries:
-        with st.expander(f"{entry.log_date.strftime('%B %d, %Y')} - Mood: {entry.mood_score}/10"):
-            st.write(entry.journal_text)
+                if entry.ai_sentiment:
+                    sentiment_color = _SENTIMENT_COLORS.get(entry.ai_sentiment, 'blue')
+                    st.markdown(_SENTIMENT_HTML.format(c=sentiment_color, s=entry.ai_sentiment), unsafe_allow_html=True)
 
-            if entry.ai_sentiment:
-                sentiment_color = {
-                    'POSITIVE': 'green',
-                    'NEGATIVE': 'red',
-                    'NEUTRAL': 'blue'
-                }.get(entry.ai_sentiment, 'blue')
+                if entry.ai_emotion:
+                    st.write(f"**Emotion:** {entry.ai_emotion.title()}")
 
-                st.markdown(f"**Sentiment:** <span style='color:{sentiment_color}'>{entry.ai_sentiment}</span>", unsafe_allow_html=True)
-
-            if entry.ai_emotion:
-                st.write(f"**Emotion:** {entry.ai_emotion.title()}")
+    if not found:
+        st.info("No journal entries found.")
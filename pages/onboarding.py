@@ -1,9 +1,10 @@
 """User onboarding wizard for collecting profile information."""
 
-import json
 import streamlit as st
-from database.connection import get_session
+from sqlalchemy import func
+from database.connection import dialect_insert, get_session
 from database.models import UserProfile
+from services.auth_service import invalidate_onboarding_status
 from utils.session_manager import get_user_id, set_page, get_session_value, set_session_value
 from utils.validators import validate_age, validate_sleep_hours
 from config.constants import HEALTH_GOALS, PROFESSION_CATEGORIES, SLEEP_QUALITY_SCALE
@@ -13,6 +14,23 @@ from components.forms import render_progress_bar
 TOTAL_STEPS = 4
 STEP_LABELS = ["Basic Info", "Sleep", "Goals", "Review"]
 
+# Lookups built once at import instead of list scans on every rerun
+_PROFESSION_INDEX = {p: i for i, p in enumerate(PROFESSION_CATEGORIES)}
+_HEALTH_GOAL_SET = frozenset(HEALTH_GOALS)
+
+_HEADER_HTML = """
+        <div style="text-align: center; margin-bottom: 1rem;">
+            <h2 style="color: #263238;">Let's Get to Know You</h2>
+            <p style="color: #607D8B;">This helps us personalize your experience</p>
+        </div>
+    """
+_REVIEW_CARD_HTML = """
+        <div class="glass-card">
+            <div class="glass-card-title">Profile Summary</div>
+        </div>
+    """
+_SPACER_HTML = "<br>"
+
 
 def render():
     """Render the onboarding wizard."""
@@ -22,12 +40,7 @@ def render():
         st.rerun()
         return
     
-    st.markdown("""
-        <div style="text-align: center; margin-bottom: 1rem;">
-            <h2 style="color: #263238;">Let's Get to Know You</h2>
-            <p style="color: #607D8B;">This helps us personalize your experience</p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Get current step
     current_step = st.session_state.get("onboarding_step", 1)
@@ -35,7 +48,7 @@ def render():
     # Render progress bar
     render_progress_bar(current_step, TOTAL_STEPS, STEP_LABELS)
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(_SPACER_HTML, unsafe_allow_html=True)
     
     # Render current step
     if current_step == 1:
@@ -70,12 +83,11 @@ def _render_step_basic_info():
         profession = st.selectbox(
             "Profession",
             options=PROFESSION_CATEGORIES,
-            index=PROFESSION_CATEGORIES.index(onboarding_data.get("profession", "Student")) 
-                  if onboarding_data.get("profession") in PROFESSION_CATEGORIES else 0,
+            index=_PROFESSION_INDEX.get(onboarding_data.get("profession"), 0),
             key="onboarding_profession"
         )
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(_SPACER_HTML, unsafe_allow_html=True)
     
     # Navigation
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -116,7 +128,7 @@ def _render_step_sleep():
     else:
         st.success("Great! 7-9 hours is recommended for adults")
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(_SPACER_HTML, unsafe_allow_html=True)
     
     sleep_quality = st.select_slider(
         "How would you rate your sleep quality?",
@@ -126,7 +138,7 @@ def _render_step_sleep():
         key="onboarding_sleep_quality"
     )
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(_SPACER_HTML, unsafe_allow_html=True)
     
     # Navigation
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -151,7 +163,8 @@ def _render_step_goals():
     st.markdown("*Select all that apply*")
     
     onboarding_data = st.session_state.get("onboarding_data", {})
-    existing_goals = onboarding_data.get("health_goals", [])
+    # Drop goals no longer offered; multiselect rejects defaults outside its options
+    existing_goals = [g for g in onboarding_data.get("health_goals", []) if g in _HEALTH_GOAL_SET]
     
     selected_goals = st.multiselect(
         "Choose your goals",
@@ -164,7 +177,7 @@ def _render_step_goals():
     if not selected_goals:
         st.info("Please select at least one goal to continue")
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(_SPACER_HTML, unsafe_allow_html=True)
     
     # Navigation
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -189,11 +202,7 @@ def _render_step_review():
     onboarding_data = st.session_state.get("onboarding_data", {})
     
     # Display summary
-    st.markdown("""
-        <div class="glass-card">
-            <div class="glass-card-title">Profile Summary</div>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_REVIEW_CARD_HTML, unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
@@ -214,7 +223,7 @@ def _render_step_review():
     else:
         st.markdown("*No goals selected*")
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(_SPACER_HTML, unsafe_allow_html=True)
     
     # Navigation
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -234,30 +243,24 @@ def _save_profile(data: dict):
     user_id = get_user_id()
     
     try:
+        values = {
+            "age": data.get("age"),
+            "profession": data.get("profession"),
+            "sleep_hours": data.get("sleep_hours"),
+            "sleep_quality": data.get("sleep_quality"),
+            "health_goals": list(data.get("health_goals", [])),
+        }
+        # One statement keyed on the unique user_id instead of SELECT then INSERT/UPDATE;
+        # set_ bypasses Column.onupdate, so refresh updated_at explicitly
+        stmt = dialect_insert(UserProfile).values(user_id=user_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={**values, "updated_at": func.now()}
+        )
+        
         with get_session() as session:
-            # Check if profile exists
-            profile = session.query(UserProfile).filter(
-                UserProfile.user_id == user_id
-            ).first()
-            
-            if profile:
-                # Update existing
-                profile.age = data.get("age")
-                profile.profession = data.get("profession")
-                profile.sleep_hours = data.get("sleep_hours")
-                profile.sleep_quality = data.get("sleep_quality")
-                profile.health_goals = json.dumps(data.get("health_goals", []))
-            else:
-                # Create new
-                profile = UserProfile(
-                    user_id=user_id,
-                    age=data.get("age"),
-                    profession=data.get("profession"),
-                    sleep_hours=data.get("sleep_hours"),
-                    sleep_quality=data.get("sleep_quality"),
-                    health_goals=json.dumps(data.get("health_goals", []))
-                )
-                session.add(profile)
+            session.execute(stmt)
+        invalidate_onboarding_status(user_id)
         
         st.success("Profile saved successfully!")
         # Clear onboarding data and move to clinical assessment
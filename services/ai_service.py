@@ -1,10 +1,138 @@
 """AI service for sentiment analysis and text processing using DistilBERT."""
 
-import streamlit as st
-from typing import Dict, Optional, Tuple
+import os
 import re
+import threading
+import numpy as np
+import streamlit as st
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config.constants import COGNITIVE_DISTORTIONS, scan_distortions
+from config.settings import settings
+
+# Optional C-accelerated multi-pattern matcher; per-category regexes are the fallback
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Use DistilBERT for faster inference
+SENTIMENT_MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+_SENTIMENT_LABELS = ("NEGATIVE", "POSITIVE")
+# Fixed sequence length of the traced TorchScript graph; covers most journal entries
+_TRACE_MAX_LENGTH = 128
+
+# Emotion keywords
+_EMOTION_KEYWORDS = {
+    "joy": ["happy", "joy", "excited", "great", "wonderful", "amazing", "love", "fantastic"],
+    "sadness": ["sad", "depressed", "unhappy", "miserable", "down", "blue", "heartbroken"],
+    "anger": ["angry", "mad", "furious", "irritated", "annoyed", "frustrated", "hate"],
+    "fear": ["scared", "afraid", "anxious", "worried", "nervous", "terrified", "panic"],
+    "surprise": ["surprised", "shocked", "amazed", "astonished", "unexpected"],
+    "disgust": ["disgusted", "gross", "repulsed", "sick", "hate", "awful"]
+}
+
+# Lexicon for entries too short to be worth a model forward pass
+_SHORT_TEXT_WORDS = 4
+_POSITIVE_WORDS = frozenset(_EMOTION_KEYWORDS["joy"])
+_NEGATIVE_WORDS = frozenset(
+    _EMOTION_KEYWORDS["sadness"] + _EMOTION_KEYWORDS["anger"]
+    + _EMOTION_KEYWORDS["fear"] + _EMOTION_KEYWORDS["disgust"]
+)
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Journal theme keywords, in display order
+_THEME_KEYWORDS = {
+    "work-related": ["work", "job", "career", "boss", "colleague"],
+    "family/relationships": ["family", "parent", "child", "spouse", "relationship"],
+    "health concerns": ["health", "sick", "pain", "doctor", "medicine"],
+    "stress/anxiety": ["stress", "anxious", "worried", "overwhelmed"],
+    "sleep/fatigue": ["sleep", "tired", "exhausted", "rest"],
+}
+
+
+def _keyword_regex(keywords: List[str]) -> re.Pattern:
+    """Compile a word-bounded alternation of keywords."""
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b")
+
+
+# One compiled alternation per category, so each scan walks the text once per category
+_EMOTION_RES = tuple((emotion, _keyword_regex(kws)) for emotion, kws in _EMOTION_KEYWORDS.items())
+_THEME_RES = tuple((theme, _keyword_regex(kws)) for theme, kws in _THEME_KEYWORDS.items())
+
+
+def _build_keyword_automaton():
+    """Build one automaton over every emotion, theme and distortion keyword."""
+    targets = {}
+    tables = (
+        ("emotion", _EMOTION_KEYWORDS),
+        ("theme", _THEME_KEYWORDS),
+        ("distortion", {name: data["patterns"] for name, data in COGNITIVE_DISTORTIONS.items()}),
+    )
+    for kind, table in tables:
+        for category, keywords in table.items():
+            for keyword in keywords:
+                # A keyword may belong to several categories ("hate", "sick")
+                targets.setdefault(keyword, []).append((kind, category))
+
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_targets in targets.items():
+        automaton.add_word(keyword, (len(keyword), tuple(keyword_targets)))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick else None
+
 
 # Lazy loading of AI models
+@st.cache_resource
+def load_onnx_sentiment_model():
+    """
+    Load an int8 ONNX Runtime build of the sentiment model (cached for performance).
+
+    The model is exported and quantized on first use and kept under
+    MODEL_CACHE_DIR, so later processes only open the saved file.
+
+    Returns:
+        Tuple of (tokenizer, InferenceSession), or (None, None) when optimum
+        and onnxruntime aren't installed and the PyTorch model should be used
+    """
+    try:
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+    except ImportError:
+        return None, None
+
+    try:
+        cache_root = Path(settings.MODEL_CACHE_DIR) if settings.MODEL_CACHE_DIR else Path.home() / ".cache" / "mindfulme"
+        model_dir = cache_root / "distilbert-sst2-onnx-int8"
+        model_path = model_dir / "model_quantized.onnx"
+
+        if not model_path.exists():
+            ort_model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_NAME, export=True)
+            quantizer = ORTQuantizer.from_pretrained(ort_model)
+            quantizer.quantize(
+                save_dir=model_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+
+        # Full graph optimization fuses attention, LayerNorm and GELU
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_NAME)
+        session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+        return tokenizer, session
+    except Exception as e:
+        st.warning(f"ONNX sentiment model unavailable, using PyTorch: {str(e)}")
+        return None, None
+
+
 @st.cache_resource
 def load_sentiment_model():
     """Load the sentiment analysis model (cached for performance)."""
@@ -12,11 +140,26 @@ def load_sentiment_model():
         from transformers import AutoTokenizer, AutoModelForSequenceClassification
         import torch
 
-        # Use DistilBERT for faster inference
-        model_name = "distilbert-base-uncased-finetuned-sst-2-english"
-
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_NAME)
+        # Fused scaled-dot-product attention instead of per-head softmax/matmul
+        # chains; older transformers releases without SDPA for DistilBERT use eager
+        try:
+            model = AutoModelForSequenceClassification.from_pretrained(
+                SENTIMENT_MODEL_NAME, attn_implementation="sdpa"
+            )
+        except (ValueError, TypeError, ImportError):
+            model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_NAME)
+        model.eval()
+
+        # Runs once per process thanks to cache_resource
+        torch.set_num_threads(os.cpu_count() or 1)
+
+        # int8 dynamic quantization of the Linear layers: ~4x smaller weights,
+        # faster CPU matmuls; keep FP32 where no quantized engine is available
+        try:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except (RuntimeError, AssertionError):
+            pass
 
         return tokenizer, model
     except ImportError:
@@ -27,6 +170,153 @@ def load_sentiment_model():
         return None, None
 
 
+@st.cache_resource
+def load_traced_sentiment_model():
+    """
+    Trace the PyTorch sentiment model for fixed-length inputs (cached for performance).
+
+    The TorchScript graph is specialized to batches padded to _TRACE_MAX_LENGTH
+    tokens and frozen, which drops Python dispatch and lets the JIT fuse ops.
+
+    Returns:
+        Traced module taking (input_ids, attention_mask), or None if tracing
+        isn't possible and the eager model should be used
+    """
+    tokenizer, model = load_sentiment_model()
+
+    if not tokenizer or not model:
+        return None
+
+    try:
+        import torch
+
+        example = tokenizer(
+            "warmup text", return_tensors="pt", padding="max_length",
+            max_length=_TRACE_MAX_LENGTH, truncation=True
+        )
+        with torch.inference_mode():
+            traced = torch.jit.trace(
+                model, (example["input_ids"], example["attention_mask"]), strict=False
+            )
+        return torch.jit.optimize_for_inference(traced)
+    except Exception:
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up_models() -> Optional[threading.Thread]:
+    """
+    Start loading the sentiment model in a background thread (once per process).
+
+    The loaders are cache_resource-backed, so the first journal save reuses
+    the resident model, or waits on the in-flight load, instead of paying
+    for the download and load itself.
+
+    Returns:
+        The loader thread, or None outside a running Streamlit app
+    """
+    if not st.runtime.exists():
+        return None
+
+    def _load():
+        tokenizer, session = load_onnx_sentiment_model()
+        if not (tokenizer and session):
+            load_traced_sentiment_model()
+
+    thread = threading.Thread(target=_load, name="sentiment-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _classify_sentiment(batch: List[str]) -> Optional[List[Tuple[str, float]]]:
+    """
+    Run the sentiment classifier on non-blank, pre-truncated texts.
+
+    Prefers the ONNX Runtime model and falls back to PyTorch.
+
+    Args:
+        batch: Texts to classify in one forward pass
+
+    Returns:
+        List of (sentiment_label, confidence_score), or None if no model is available
+    """
+    tokenizer, session = load_onnx_sentiment_model()
+
+    if tokenizer and session:
+        inputs = tokenizer(batch, return_tensors="np", padding=True, truncation=True, max_length=512)
+        feed = {arg.name: inputs[arg.name].astype(np.int64) for arg in session.get_inputs()}
+        logits = session.run(None, feed)[0]
+
+        # Softmax in NumPy, shifted by the row max for stability
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probabilities = exp / exp.sum(axis=-1, keepdims=True)
+
+        return [
+            (_SENTIMENT_LABELS[label_idx], float(confidence))
+            for label_idx, confidence in zip(probabilities.argmax(axis=-1), probabilities.max(axis=-1))
+        ]
+
+    tokenizer, model = load_sentiment_model()
+
+    if not tokenizer or not model:
+        return None
+
+    import torch
+
+    inputs = tokenizer(batch, return_tensors="pt", padding=True, truncation=True, max_length=512)
+    traced = load_traced_sentiment_model()
+    seq_len = inputs["input_ids"].shape[1]
+
+    logits = None
+    with torch.inference_mode():
+        if traced is not None and seq_len <= _TRACE_MAX_LENGTH:
+            # Right-pad to the traced shape; masked positions don't affect the logits
+            pad = _TRACE_MAX_LENGTH - seq_len
+            input_ids = torch.nn.functional.pad(inputs["input_ids"], (0, pad), value=tokenizer.pad_token_id)
+            attention_mask = torch.nn.functional.pad(inputs["attention_mask"], (0, pad), value=0)
+            try:
+                outputs = traced(input_ids, attention_mask)
+                logits = outputs["logits"] if isinstance(outputs, dict) else outputs[0]
+            except RuntimeError:
+                # Graph didn't generalize to this batch shape; use the eager model
+                logits = None
+        if logits is None:
+            logits = model(**inputs).logits
+
+    probabilities = torch.nn.functional.softmax(logits, dim=-1)
+    confidences, predicted = torch.max(probabilities, dim=-1)
+
+    return [
+        (_SENTIMENT_LABELS[label_idx], confidence)
+        for label_idx, confidence in zip(predicted.tolist(), confidences.tolist())
+    ]
+
+
+def _short_text_sentiment(text: str) -> Optional[Tuple[str, float]]:
+    """
+    Score very short text with the emotion lexicon instead of the model.
+
+    Args:
+        text: Stripped, non-blank input text
+
+    Returns:
+        Tuple of (sentiment_label, confidence_score), or None if the text has
+        enough words to go through the model
+    """
+    if len(text.split()) >= _SHORT_TEXT_WORDS:
+        return None
+
+    words = _WORD_RE.findall(text.lower())
+    positive = sum(word in _POSITIVE_WORDS for word in words)
+    negative = sum(word in _NEGATIVE_WORDS for word in words)
+
+    if positive > negative:
+        return "POSITIVE", 0.6
+    if negative > positive:
+        return "NEGATIVE", 0.6
+    return "NEUTRAL", 0.5
+
+
 def analyze_sentiment(text: str) -> Tuple[str, float]:
     """
     Analyze sentiment of text using DistilBERT.
@@ -37,80 +327,195 @@ def analyze_sentiment(text: str) -> Tuple[str, float]:
     Returns:
         Tuple of (sentiment_label, confidence_score)
     """
-    if not text or not text.strip():
+    try:
+        return _sentiment_or_none(text) or ("NEUTRAL", 0.5)
+
+    except Exception as e:
+        st.warning(f"Sentiment analysis failed: {str(e)}")
         return "NEUTRAL", 0.5
 
-    tokenizer, model = load_sentiment_model()
 
-    if not tokenizer or not model:
+def _sentiment_or_none(text: str) -> Optional[Tuple[str, float]]:
+    """
+    analyze_sentiment without the fallback: model errors propagate.
+
+    Returns:
+        Tuple of (sentiment_label, confidence_score), or None if no model is available
+    """
+    if not text or not text.strip():
         return "NEUTRAL", 0.5
 
-    try:
-        # Preprocess text
-        text = text.strip()
-        if len(text) > 512:  # Truncate if too long
-            text = text[:512]
+    text = text.strip()
+    short_result = _short_text_sentiment(text)
+    if short_result:
+        return short_result
 
-        # Tokenize and predict
-        inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-        outputs = model(**inputs)
+    # Truncate long text before tokenizing
+    results = _classify_sentiment([text[:512]])
+    return results[0] if results else None
 
-        # Get probabilities
-        import torch
-        probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        confidence, predicted_class = torch.max(probabilities, dim=-1)
 
-        # Map to sentiment labels
-        labels = ["NEGATIVE", "POSITIVE"]
-        sentiment = labels[predicted_class.item()]
-        confidence_score = confidence.item()
+def analyze_sentiment_batch(texts: List[str]) -> List[Tuple[str, float]]:
+    """
+    Analyze sentiment of several texts with one DistilBERT forward pass.
+
+    Args:
+        texts: Input texts to analyze
 
-        return sentiment, confidence_score
+    Returns:
+        List of (sentiment_label, confidence_score), one per input text
+    """
+    try:
+        return _sentiment_batch_or_none(texts) or _short_sentiments(texts)[0]
 
     except Exception as e:
         st.warning(f"Sentiment analysis failed: {str(e)}")
-        return "NEUTRAL", 0.5
+        return _short_sentiments(texts)[0]
 
 
-def analyze_emotion(text: str) -> str:
+def _short_sentiments(texts: List[str]) -> Tuple[List[Tuple[str, float]], List[int]]:
     """
-    Analyze emotion in text using keyword-based approach.
-    This is a simplified emotion detection for demo purposes.
+    Score blank and very short texts without the model.
+
+    Blank texts get the neutral default and short ones use the lexicon;
+    everything else is neutral for now and listed for the model batch.
+
+    Returns:
+        Tuple of (results, indices of texts that need the model)
+    """
+    results = [("NEUTRAL", 0.5)] * len(texts)
+    indices = []
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        short_result = _short_text_sentiment(text.strip())
+        if short_result:
+            results[i] = short_result
+        else:
+            indices.append(i)
+    return results, indices
+
+
+def _sentiment_batch_or_none(texts: List[str]) -> Optional[List[Tuple[str, float]]]:
+    """
+    analyze_sentiment_batch without the fallback: model errors propagate.
+
+    Returns:
+        List of (sentiment_label, confidence_score), or None if texts need
+        the model and no model is available
+    """
+    results, indices = _short_sentiments(texts)
+    if not indices:
+        return results
+
+    predictions = _classify_sentiment([texts[i].strip()[:512] for i in indices])
+    if not predictions:
+        return None
+
+    for i, prediction in zip(indices, predictions):
+        results[i] = prediction
+    return results
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the regex \\w definition used for keyword boundaries."""
+    return char.isalnum() or char == "_"
+
+
+def scan_keywords(text: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Find emotion, theme and cognitive-distortion keywords in text.
+
+    Uses a single Aho-Corasick pass when pyahocorasick is installed and
+    falls back to the per-category regexes otherwise.
 
     Args:
-        text: Input text to analyze
+        text: Input text to scan
 
     Returns:
-        Emotion label
+        Dict keyed by "emotion", "theme" and "distortion", each mapping a
+        category to the keywords matched for it
     """
+    hits = {"emotion": {}, "theme": {}, "distortion": {}}
     if not text:
-        return "neutral"
+        return hits
 
     text_lower = text.lower()
 
-    # Emotion keywords
-    emotions = {
-        "joy": ["happy", "joy", "excited", "great", "wonderful", "amazing", "love", "fantastic"],
-        "sadness": ["sad", "depressed", "unhappy", "miserable", "down", "blue", "heartbroken"],
-        "anger": ["angry", "mad", "furious", "irritated", "annoyed", "frustrated", "hate"],
-        "fear": ["scared", "afraid", "anxious", "worried", "nervous", "terrified", "panic"],
-        "surprise": ["surprised", "shocked", "amazed", "astonished", "unexpected"],
-        "disgust": ["disgusted", "gross", "repulsed", "sick", "hate", "awful"]
+    if _KEYWORD_AUTOMATON is not None:
+        text_len = len(text_lower)
+        for end, (length, targets) in _KEYWORD_AUTOMATON.iter(text_lower):
+            start = end - length + 1
+            # Whole words only, like the \\b-bounded regexes
+            if start > 0 and _is_word_char(text_lower[start - 1]):
+                continue
+            if end + 1 < text_len and _is_word_char(text_lower[end + 1]):
+                continue
+            keyword = text_lower[start:end + 1]
+            for kind, category in targets:
+                hits[kind].setdefault(category, []).append(keyword)
+        return hits
+
+    for emotion, regex in _EMOTION_RES:
+        found = regex.findall(text_lower)
+        if found:
+            hits["emotion"][emotion] = found
+    for theme, regex in _THEME_RES:
+        match = regex.search(text_lower)
+        if match:
+            hits["theme"][theme] = [match.group(0)]
+    for name, pattern in scan_distortions(text):
+        hits["distortion"][name] = [pattern]
+
+    return hits
+
+
+def _emotion_from_hits(emotion_hits: Dict[str, List[str]]) -> str:
+    """Pick the emotion with the most keyword hits (table order breaks ties)."""
+    emotion_scores = {
+        emotion: len(emotion_hits[emotion])
+        for emotion in _EMOTION_KEYWORDS
+        if emotion in emotion_hits
     }
 
-    # Count emotion keywords
-    emotion_scores = {}
-    for emotion, keywords in emotions.items():
-        count = sum(1 for keyword in keywords if keyword in text_lower)
-        if count > 0:
-            emotion_scores[emotion] = count
-
     if emotion_scores:
         return max(emotion_scores, key=emotion_scores.get)
 
     return "neutral"
 
 
+def _themes_from_hits(theme_hits: Dict[str, List[str]]) -> List[str]:
+    """List matched themes in display order."""
+    return [theme for theme in _THEME_KEYWORDS if theme in theme_hits]
+
+
+def _distortions_from_hits(distortion_hits: Dict[str, List[str]]) -> List[Dict]:
+    """Describe matched distortions, one entry per category."""
+    return [
+        {
+            "type": distortion_name,
+            "description": data["description"],
+            "matched_pattern": distortion_hits[distortion_name][0]
+        }
+        for distortion_name, data in COGNITIVE_DISTORTIONS.items()
+        if distortion_name in distortion_hits
+    ]
+
+
+def analyze_emotion(text: str) -> str:
+    """
+    Analyze emotion in text using keyword-based approach.
+    This is a simplified emotion detection for demo purposes.
+
+    Args:
+        text: Input text to analyze
+
+    Returns:
+        Emotion label
+    """
+    return _emotion_from_hits(scan_keywords(text)["emotion"])
+
+
 def detect_cognitive_distortions(text: str) -> List[Dict]:
     """
     Detect cognitive distortions in text.
@@ -121,26 +526,20 @@ def detect_cognitive_distortions(text: str) -> List[Dict]:
     Returns:
         List of detected distortions with explanations
     """
-    from config.constants import COGNITIVE_DISTORTIONS
+    return _distortions_from_hits(scan_keywords(text)["distortion"])
 
-    detected = []
-    text_lower = text.lower()
 
-    for distortion_name, distortion_data in COGNITIVE_DISTORTIONS.items():
-        patterns = distortion_data["patterns"]
-        description = distortion_data["description"]
+def detect_themes(text: str) -> List[str]:
+    """
+    Detect broad journal themes using keyword matching.
 
-        # Check if any pattern matches
-        for pattern in patterns:
-            if re.search(r'\b' + re.escape(pattern) + r'\b', text_lower):
-                detected.append({
-                    "type": distortion_name,
-                    "description": description,
-                    "matched_pattern": pattern
-                })
-                break  # Only add once per distortion type
+    Args:
+        text: Input text to analyze
 
-    return detected
+    Returns:
+        List of theme labels
+    """
+    return _themes_from_hits(scan_keywords(text)["theme"])
 
 
 def generate_journal_insights(text: str) -> Dict:
@@ -153,7 +552,24 @@ def generate_journal_insights(text: str) -> Dict:
     Returns:
         Dict with various insights
     """
-    insights = {
+    if not text or not text.strip():
+        return _empty_insights()
+
+    # Failed or unavailable sentiment is kept out of the cache, so the next
+    # call retries the model instead of reusing a stand-in NEUTRAL
+    try:
+        return _insights_impl(text)
+    except _SentimentUnavailable:
+        pass
+    except Exception as e:
+        st.warning(f"Sentiment analysis failed: {str(e)}")
+
+    return _build_insights(text, "NEUTRAL", 0.5)
+
+
+def _empty_insights() -> Dict:
+    """Insights for a blank entry; also the starting point for real analysis."""
+    return {
         "sentiment": "NEUTRAL",
         "sentiment_confidence": 0.0,
         "emotion": "neutral",
@@ -163,38 +579,41 @@ def generate_journal_insights(text: str) -> Dict:
         "recommendations": []
     }
 
-    if not text or not text.strip():
-        return insights
+
+class _SentimentUnavailable(Exception):
+    """Raised inside memoized analysis when no sentiment model could be loaded."""
+
+
+@st.cache_data(show_spinner=False, max_entries=1024)
+def _insights_impl(text: str) -> Dict:
+    """
+    Analyze non-blank journal text (memoized per text, so reruns skip the model).
+
+    Model errors, and _SentimentUnavailable when there is no model,
+    propagate so that only real predictions are cached.
+    """
+    result = _sentiment_or_none(text)
+    if result is None:
+        raise _SentimentUnavailable()
+    return _build_insights(text, *result)
+
+
+def _build_insights(text: str, sentiment: str, confidence: float) -> Dict:
+    """Build the insights dict for non-blank text from its sentiment."""
+    insights = _empty_insights()
 
     # Basic text analysis
     insights["word_count"] = len(text.split())
 
     # Sentiment analysis
-    sentiment, confidence = analyze_sentiment(text)
     insights["sentiment"] = sentiment
     insights["sentiment_confidence"] = confidence
 
-    # Emotion analysis
-    insights["emotion"] = analyze_emotion(text)
-
-    # Cognitive distortions
-    insights["cognitive_distortions"] = detect_cognitive_distortions(text)
-
-    # Simple theme detection
-    text_lower = text.lower()
-    themes = []
-
-    if any(word in text_lower for word in ["work", "job", "career", "boss", "colleague"]):
-        themes.append("work-related")
-    if any(word in text_lower for word in ["family", "parent", "child", "spouse", "relationship"]):
-        themes.append("family/relationships")
-    if any(word in text_lower for word in ["health", "sick", "pain", "doctor", "medicine"]):
-        themes.append("health concerns")
-    if any(word in text_lower for word in ["stress", "anxious", "worried", "overwhelmed"]):
-        themes.append("stress/anxiety")
-    if any(word in text_lower for word in ["sleep", "tired", "exhausted", "rest"]):
-        themes.append("sleep/fatigue")
-
+    # Emotion, distortion and theme keywords in one scan
+    hits = scan_keywords(text)
+    insights["emotion"] = _emotion_from_hits(hits["emotion"])
+    insights["cognitive_distortions"] = _distortions_from_hits(hits["distortion"])
+    themes = _themes_from_hits(hits["theme"])
     insights["themes"] = themes
 
     # Generate recommendations based on analysis
@@ -232,16 +651,42 @@ def summarize_journal_entries(entries: List[str]) -> str:
     if not entries:
         return "No entries to summarize."
 
+    # As with insights, only summaries built from real predictions are cached
+    try:
+        return _summarize_impl(tuple(entries))
+    except _SentimentUnavailable:
+        pass
+    except Exception as e:
+        st.warning(f"Sentiment analysis failed: {str(e)}")
+
+    return _build_summary(entries, _short_sentiments(entries)[0])
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _summarize_impl(entries: Tuple[str, ...]) -> str:
+    """Summarize a non-empty tuple of journal texts (memoized per entry tuple)."""
+    # One batched model pass for all entries
+    results = _sentiment_batch_or_none(list(entries))
+    if results is None:
+        raise _SentimentUnavailable()
+    return _build_summary(entries, results)
+
+
+def _build_summary(entries: Tuple[str, ...], results: List[Tuple[str, float]]) -> str:
+    """Build the summary text from the entries and their sentiment results."""
     total_entries = len(entries)
-    sentiments = []
     emotions = []
     themes = []
+    sentiments = [sentiment for sentiment, _ in results]
 
+    # Keyword analysis stays per entry
     for entry in entries:
-        insights = generate_journal_insights(entry)
-        sentiments.append(insights["sentiment"])
-        emotions.append(insights["emotion"])
-        themes.extend(insights["themes"])
+        if not entry or not entry.strip():
+            emotions.append("neutral")
+            continue
+        hits = scan_keywords(entry)
+        emotions.append(_emotion_from_hits(hits["emotion"]))
+        themes.extend(_themes_from_hits(hits["theme"]))
 
     # Analyze patterns
     positive_count = sentiments.count("POSITIVE")
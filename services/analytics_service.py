@@ -1,9 +1,12 @@
 """Analytics service for dashboard data aggregation and calculations."""
 
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+import streamlit as st
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from sqlalchemy import func
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
 
 from database.connection import get_session
 from database.models import DailyLog, UserProfile, HealthBaseline
@@ -17,6 +20,12 @@ def get_user_analytics(user_id: int) -> Dict:
     Returns:
         Dict containing various analytics metrics
     """
+    with get_session(readonly=True) as session:
+        return _query_user_analytics(session, user_id)
+
+
+def _query_user_analytics(session: Session, user_id: int) -> Dict:
+    """Run the get_user_analytics queries on an open session."""
     analytics = {
         'current_mood': 5,  # Default
         'weekly_mood_avg': 0.0,
@@ -28,58 +37,62 @@ def get_user_analytics(user_id: int) -> Dict:
         'assessment_completed': False
     }
 
-    with get_session() as session:
-        # Get current mood (today's log)
-        today = datetime.now().date()
-        today_log = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id,
-            DailyLog.log_date == today
-        ).first()
-
-        if today_log:
-            analytics['current_mood'] = today_log.mood_score
-
-        # Get weekly mood average
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        weekly_logs = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id,
-            DailyLog.log_date >= seven_days_ago.date()
-        ).all()
-
-        if weekly_logs:
-            analytics['weekly_mood_avg'] = sum(log.mood_score for log in weekly_logs) / len(weekly_logs)
-            analytics['total_journals'] = len([log for log in weekly_logs if log.journal_text])
-
-        # Get mood trend data
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        monthly_logs = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id,
-            DailyLog.log_date >= thirty_days_ago.date()
-        ).order_by(DailyLog.log_date).all()
-
-        analytics['mood_trend'] = [
-            {'date': log.log_date.isoformat(), 'mood': log.mood_score}
-            for log in monthly_logs
-        ]
-
-        # Sentiment distribution
-        sentiment_counts = {}
-        for log in monthly_logs:
-            if log.ai_sentiment:
-                sentiment_counts[log.ai_sentiment] = sentiment_counts.get(log.ai_sentiment, 0) + 1
-
-        analytics['sentiment_distribution'] = sentiment_counts
-
-        # Average sleep hours
-        sleep_logs = [log for log in monthly_logs if log.sleep_hours]
-        if sleep_logs:
-            analytics['sleep_avg'] = sum(log.sleep_hours for log in sleep_logs) / len(sleep_logs)
-
-        # Check if assessment completed
-        baseline = session.query(HealthBaseline).filter(
-            HealthBaseline.user_id == user_id
-        ).first()
-        analytics['assessment_completed'] = baseline is not None
+    # Window boundaries as plain dates, computed once
+    today = datetime.now().date()
+    seven_days_ago = today - timedelta(days=7)
+    thirty_days_ago = today - timedelta(days=30)
+
+    # Weekly mood average and journal count, aggregated in SQL
+    weekly_avg, weekly_journals = session.query(
+        func.avg(DailyLog.mood_score),
+        func.count(func.nullif(DailyLog.journal_text, '')),
+    ).filter(
+        DailyLog.user_id == user_id,
+        DailyLog.log_date >= seven_days_ago
+    ).one()
+
+    if weekly_avg is not None:
+        analytics['weekly_mood_avg'] = float(weekly_avg)
+    analytics['total_journals'] = weekly_journals
+
+    # Get mood trend data (only the two columns the chart needs)
+    month_filter = (
+        DailyLog.user_id == user_id,
+        DailyLog.log_date >= thirty_days_ago
+    )
+    trend_rows = session.query(DailyLog.log_date, DailyLog.mood_score).filter(
+        *month_filter
+    ).order_by(DailyLog.user_id, DailyLog.log_date).all()  # (user_id, log_date) index order
+
+    analytics['mood_trend'] = [
+        {'date': log_date.isoformat(), 'mood': mood_score}
+        for log_date, mood_score in trend_rows
+    ]
+
+    # Current mood is today's row, which the trend already holds
+    if trend_rows and trend_rows[-1][0] == today:
+        analytics['current_mood'] = trend_rows[-1][1]
+
+    # Sentiment distribution
+    sentiment_rows = session.query(DailyLog.ai_sentiment, func.count()).filter(
+        *month_filter,
+        func.nullif(DailyLog.ai_sentiment, '').isnot(None)
+    ).group_by(DailyLog.ai_sentiment).all()
+
+    analytics['sentiment_distribution'] = dict(sentiment_rows)
+
+    # Average sleep hours (zero/missing hours are not counted)
+    sleep_avg = session.query(func.avg(func.nullif(DailyLog.sleep_hours, 0))).filter(
+        *month_filter
+    ).scalar()
+    if sleep_avg is not None:
+        analytics['sleep_avg'] = float(sleep_avg)
+
+    # Check if assessment completed
+    baseline_id = session.query(HealthBaseline.id).filter(
+        HealthBaseline.user_id == user_id
+    ).first()
+    analytics['assessment_completed'] = baseline_id is not None
 
     return analytics
 
@@ -91,45 +104,70 @@ def calculate_burnout_risk(user_id: int) -> float:
     Returns:
         Burnout score (0-100)
     """
-    score = 0.0
+    with get_session(readonly=True) as session:
+        return _compute_burnout(_fetch_burnout_inputs(session, user_id, 7))
 
-    with get_session() as session:
-        # Get last 7 days of data
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        recent_logs = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id,
-            DailyLog.log_date >= seven_days_ago.date()
-        ).all()
 
-        if not recent_logs:
-            return 0.0
+def _fetch_burnout_inputs(session: Session, user_id: int, days: int) -> Tuple:
+    """
+    Aggregate the last `days` days of a user's logs into burnout inputs.
+    
+    Everything is reduced in SQL, so a single row comes back regardless
+    of how many days are logged.
+    
+    Returns:
+        Row of (mood_avg, sleep_avg, tension_avg, negative_count, total_count);
+        averages are None when no readings exist
+    """
+    since = (datetime.now() - timedelta(days=days)).date()
+    return session.query(
+        func.avg(DailyLog.mood_score),
+        func.avg(func.nullif(DailyLog.sleep_hours, 0)),
+        func.avg(func.nullif(DailyLog.vocal_tension, 0)),
+        func.coalesce(func.sum(case((DailyLog.ai_sentiment == 'NEGATIVE', 1), else_=0)), 0),
+        func.count()
+    ).filter(
+        DailyLog.user_id == user_id,
+        DailyLog.log_date >= since
+    ).one()
+
+
+def _compute_burnout(inputs: Tuple) -> float:
+    """
+    Calculate the burnout risk score from aggregated recent log data.
+    
+    Args:
+        inputs: Row returned by _fetch_burnout_inputs
+    
+    Returns:
+        Burnout score (0-100)
+    """
+    mood_avg, sleep_avg, tension_avg, negative_count, total_count = inputs
+    if not total_count:
+        return 0.0
 
-        # Factors contributing to burnout:
-        # 1. Low mood scores (weight: 40%)
-        mood_scores = [log.mood_score for log in recent_logs]
-        avg_mood = sum(mood_scores) / len(mood_scores)
-        mood_factor = max(0, (6 - avg_mood) / 5) * 40  # Lower mood = higher risk
+    # Factors contributing to burnout (NULL and, for sleep/tension, zero readings are skipped):
+    # 1. Low mood scores (weight: 40%)
+    mood_factor = 0
+    if mood_avg is not None:
+        mood_factor = max(0, (6 - float(mood_avg)) / 5) * 40  # Lower mood = higher risk
 
-        # 2. Low sleep quality/hours (weight: 30%)
-        sleep_factor = 0
-        sleep_logs = [log for log in recent_logs if log.sleep_hours]
-        if sleep_logs:
-            avg_sleep = sum(log.sleep_hours for log in sleep_logs) / len(sleep_logs)
-            sleep_factor = max(0, (8 - avg_sleep) / 8) * 30  # Less than 8 hours = higher risk
+    # 2. Low sleep quality/hours (weight: 30%)
+    sleep_factor = 0
+    if sleep_avg is not None:
+        sleep_factor = max(0, (8 - float(sleep_avg)) / 8) * 30  # Less than 8 hours = higher risk
 
-        # 3. Negative sentiment in journals (weight: 20%)
-        negative_count = sum(1 for log in recent_logs if log.ai_sentiment == 'NEGATIVE')
-        sentiment_factor = (negative_count / len(recent_logs)) * 20
+    # 3. Negative sentiment in journals (weight: 20%)
+    sentiment_factor = (negative_count / total_count) * 20
 
-        # 4. High vocal tension (weight: 10%)
-        tension_logs = [log for log in recent_logs if log.vocal_tension]
-        if tension_logs:
-            avg_tension = sum(log.vocal_tension for log in tension_logs) / len(tension_logs)
-            tension_factor = (avg_tension / 100) * 10
+    # 4. High vocal tension (weight: 10%)
+    tension_factor = 0
+    if tension_avg is not None:
+        tension_factor = (float(tension_avg) / 100) * 10
 
-        score = mood_factor + sleep_factor + sentiment_factor + tension_factor
+    score = mood_factor + sleep_factor + sentiment_factor + tension_factor
 
-    return min(100, score)
+    return float(min(100, score))
 
 
 def get_mood_patterns(user_id: int) -> Dict:
@@ -147,50 +185,42 @@ def get_mood_patterns(user_id: int) -> Dict:
         'trends': []
     }
 
-    with get_session() as session:
-        # Get all logs for analysis
-        logs = session.query(DailyLog).filter(
-            DailyLog.user_id == user_id
-        ).order_by(DailyLog.log_date).all()
+    with get_session(readonly=True) as session:
+        # Get all mood readings for analysis
+        logs = session.query(DailyLog.log_date, DailyLog.mood_score).filter(
+            DailyLog.user_id == user_id,
+            DailyLog.mood_score.isnot(None)
+        ).order_by(DailyLog.user_id, DailyLog.log_date).all()
 
-        if len(logs) < 7:
-            return patterns
+    if len(logs) < 7:
+        return patterns
 
-        # Find best and worst days
-        mood_scores = [(log.log_date, log.mood_score) for log in logs]
-        best_day = max(mood_scores, key=lambda x: x[1])
-        worst_day = min(mood_scores, key=lambda x: x[1])
+    scores = np.fromiter((mood for _, mood in logs), dtype=np.float64, count=len(logs))
 
-        patterns['best_day'] = {
-            'date': best_day[0].isoformat(),
-            'mood': best_day[1]
-        }
-        patterns['worst_day'] = {
-            'date': worst_day[0].isoformat(),
-            'mood': worst_day[1]
-        }
-
-        # Calculate consistency (lower variance = higher consistency)
-        scores = [log.mood_score for log in logs]
-        if len(scores) > 1:
-            mean_score = sum(scores) / len(scores)
-            variance = sum((x - mean_score) ** 2 for x in scores) / len(scores)
-            patterns['consistency_score'] = max(0, 10 - variance)  # Scale to 0-10
+    # Find best and worst days (first occurrence wins ties)
+    best_date, best_mood = logs[int(scores.argmax())]
+    worst_date, worst_mood = logs[int(scores.argmin())]
 
-        # Simple trend analysis (last 14 days vs previous 14 days)
-        if len(logs) >= 28:
-            recent_14 = logs[-14:]
-            previous_14 = logs[-28:-14]
+    patterns['best_day'] = {
+        'date': best_date.isoformat(),
+        'mood': best_mood
+    }
+    patterns['worst_day'] = {
+        'date': worst_date.isoformat(),
+        'mood': worst_mood
+    }
 
-            recent_avg = sum(log.mood_score for log in recent_14) / len(recent_14)
-            previous_avg = sum(log.mood_score for log in previous_14) / len(previous_14)
+    # Calculate consistency (lower variance = higher consistency)
+    patterns['consistency_score'] = max(0.0, 10 - float(scores.var()))  # Scale to 0-10
 
-            improvement = recent_avg - previous_avg
-            patterns['trends'].append({
-                'period': 'Last 2 weeks',
-                'change': improvement,
-                'direction': 'improving' if improvement > 0 else 'declining'
-            })
+    # Simple trend analysis (last 14 days vs previous 14 days)
+    if len(scores) >= 28:
+        improvement = float(scores[-14:].mean() - scores[-28:-14].mean())
+        patterns['trends'].append({
+            'period': 'Last 2 weeks',
+            'change': improvement,
+            'direction': 'improving' if improvement > 0 else 'declining'
+        })
 
     return patterns
 
@@ -199,6 +229,25 @@ def get_weekly_report(user_id: int) -> Dict:
     """
     Generate a weekly mental health report.
     
+    Returns:
+        Dict with weekly insights
+    """
+    # One session for both the analytics and burnout queries
+    with get_session(readonly=True) as session:
+        analytics = _query_user_analytics(session, user_id)
+        burnout_score = _compute_burnout(_fetch_burnout_inputs(session, user_id, 7))
+
+    return build_weekly_report(analytics, burnout_score)
+
+
+def build_weekly_report(analytics: Dict, burnout_score: float) -> Dict:
+    """
+    Build the weekly report from already computed analytics.
+    
+    Args:
+        analytics: Result of get_user_analytics
+        burnout_score: Result of calculate_burnout_risk
+        
     Returns:
         Dict with weekly insights
     """
@@ -210,8 +259,6 @@ def get_weekly_report(user_id: int) -> Dict:
         'achievements': []
     }
 
-    analytics = get_user_analytics(user_id)
-
     # Mood summary
     weekly_avg = analytics['weekly_mood_avg']
     if weekly_avg >= 8:
@@ -243,7 +290,6 @@ def get_weekly_report(user_id: int) -> Dict:
         report['achievements'].append('Regular reflection practice')
 
     # Recommendations based on data
-    burnout_score = calculate_burnout_risk(user_id)
     if burnout_score > BURNOUT_THRESHOLDS['medium']['max_score']:
         report['recommendations'].append('Consider taking a break and practicing self-care')
     elif burnout_score > BURNOUT_THRESHOLDS['low']['max_score']:
@@ -253,3 +299,63 @@ def get_weekly_report(user_id: int) -> Dict:
         report['recommendations'].append('Try incorporating daily mindfulness or exercise')
 
     return report
+
+
+# Cached variants for the dashboard. Entries are keyed on (user_id, day) so
+# they roll over at midnight; invalidate_user_cache drops a user's entries
+# after one of their logs changes.
+
+def _day_key() -> str:
+    """Day bucket for the analytics caches."""
+    return date.today().isoformat()
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_user_analytics(user_id: int, day: str) -> Dict:
+    """Cached get_user_analytics for one user and day."""
+    return get_user_analytics(user_id)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_burnout_risk(user_id: int, day: str) -> float:
+    """Cached calculate_burnout_risk for one user and day."""
+    return calculate_burnout_risk(user_id)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_mood_patterns(user_id: int, day: str) -> Dict:
+    """Cached get_mood_patterns for one user and day."""
+    return get_mood_patterns(user_id)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_weekly_report(user_id: int, day: str) -> Dict:
+    """Cached weekly report, built from the cached analytics and burnout score."""
+    return build_weekly_report(_cached_user_analytics(user_id, day), _cached_burnout_risk(user_id, day))
+
+
+def cached_user_analytics(user_id: int) -> Dict:
+    """get_user_analytics, served from memory for up to 15 minutes."""
+    return _cached_user_analytics(user_id, _day_key())
+
+
+def cached_burnout_risk(user_id: int) -> float:
+    """calculate_burnout_risk, served from memory for up to 15 minutes."""
+    return _cached_burnout_risk(user_id, _day_key())
+
+
+def cached_mood_patterns(user_id: int) -> Dict:
+    """get_mood_patterns, served from memory for up to 15 minutes."""
+    return _cached_mood_patterns(user_id, _day_key())
+
+
+def cached_weekly_report(user_id: int) -> Dict:
+    """get_weekly_report, served from memory for up to 15 minutes."""
+    return _cached_weekly_report(user_id, _day_key())
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Drop a user's cached analytics for today, e.g. after a DailyLog write."""
+    day = _day_key()
+    for cached in (_cached_user_analytics, _cached_burnout_risk, _cached_mood_patterns, _cached_weekly_report):
+        cached.clear(user_id, day)
@@ -1,28 +1,96 @@
 """Authentication service for user management."""
 
 import bcrypt
-from typing import Optional, Tuple
+import hashlib
+import logging
+import os
+import time
+import streamlit as st
+from typing import Dict, Optional, Tuple
+from sqlalchemy import or_, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from database.models import User, UserProfile, HealthBaseline
 from database.connection import get_session
 
+logger = logging.getLogger(__name__)
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    # argon2id at the OWASP baseline: 19 MiB, 2 iterations, 1 lane
+    _ARGON2 = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+except ImportError:
+    _ARGON2 = None
+
+# Recently rejected logins, so identical retries skip bcrypt for a short window.
+# Keys hold a keyed digest of the password, never the password itself.
+_FAILED_LOGIN_TTL = 5.0
+_FAILED_LOGIN_MAX = 1024
+_FAILED_LOGIN_KEY = os.urandom(16)
+_failed_logins: Dict[Tuple[str, str, bytes], float] = {}
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt with salt."""
+    """Hash a password using argon2id, or bcrypt with salt when argon2-cffi isn't installed."""
+    if _ARGON2:
+        return _ARGON2.hash(password)
+    
     salt = bcrypt.gensalt(rounds=12)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
+    """Verify a password against its argon2id or bcrypt hash."""
+    if hashed_password.startswith('$argon2'):
+        if not _ARGON2:
+            return False
+        try:
+            return _ARGON2.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
     return bcrypt.checkpw(
         password.encode('utf-8'), 
         hashed_password.encode('utf-8')
     )
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash should be upgraded (bcrypt, or outdated argon2 parameters)."""
+    if not _ARGON2:
+        return False
+    if hashed_password.startswith('$argon2'):
+        return _ARGON2.check_needs_rehash(hashed_password)
+    return True
+
+
+def _failed_login_key(username: str, hashed_password: str, password: str) -> Tuple[str, str, bytes]:
+    """Build the failed-login cache key; the stored hash is included so a new password invalidates it."""
+    digest = hashlib.blake2b(password.encode('utf-8'), digest_size=16, key=_FAILED_LOGIN_KEY).digest()
+    return username, hashed_password, digest
+
+
+def _recently_failed(key: Tuple[str, str, bytes]) -> bool:
+    """Check whether this exact login attempt was rejected within the TTL."""
+    expires = _failed_logins.get(key)
+    if expires is None:
+        return False
+    if expires < time.monotonic():
+        _failed_logins.pop(key, None)
+        return False
+    return True
+
+
+def _remember_failed(key: Tuple[str, str, bytes]) -> None:
+    """Record a rejected login attempt, evicting the oldest entry when full."""
+    if len(_failed_logins) >= _FAILED_LOGIN_MAX:
+        _failed_logins.pop(next(iter(_failed_logins), None), None)
+    _failed_logins[key] = time.monotonic() + _FAILED_LOGIN_TTL
+
+
 def create_user(username: str, email: str, password: str) -> Tuple[bool, str, Optional[int]]:
     """
     Create a new user account.
@@ -31,18 +99,14 @@ def create_user(username: str, email: str, password: str) -> Tuple[bool, str, Op
         Tuple of (success: bool, message: str, user_id: Optional[int])
     """
     with get_session() as session:
-        # Check if username already exists
-        existing_user = session.query(User).filter(
-            User.username == username
-        ).first()
-        if existing_user:
+        # Check username and email uniqueness together; both columns are
+        # unique, so at most two rows come back
+        clashes = session.query(User.username, User.email).filter(
+            or_(User.username == username, User.email == email)
+        ).all()
+        if any(clash.username == username for clash in clashes):
             return False, "Username already exists", None
-        
-        # Check if email already exists
-        existing_email = session.query(User).filter(
-            User.email == email
-        ).first()
-        if existing_email:
+        if clashes:
             return False, "Email already registered", None
         
         # Create new user
@@ -66,7 +130,7 @@ def authenticate_user(username: str, password: str) -> Tuple[bool, str, Optional
     Returns:
         Tuple of (success: bool, message: str, user_id: Optional[int])
     """
-    with get_session() as session:
+    with get_session(readonly=True) as session:
         user = session.query(User).filter(
             User.username == username
         ).first()
@@ -74,16 +138,36 @@ def authenticate_user(username: str, password: str) -> Tuple[bool, str, Optional
         if not user:
             return False, "Invalid username or password", None
         
+        # Only rejections are cached; a correct password is always fully verified
+        attempt_key = _failed_login_key(username, user.hashed_password, password)
+        if _recently_failed(attempt_key):
+            return False, "Invalid username or password", None
+        
         if not verify_password(password, user.hashed_password):
+            _remember_failed(attempt_key)
             return False, "Invalid username or password", None
         
-        return True, "Login successful", user.id
+        user_id = user.id
+        stale_hash = needs_rehash(user.hashed_password)
+    
+    # Migrate bcrypt users to argon2id while the plaintext is at hand; a failed
+    # write doesn't block the login and is retried on the next one
+    if stale_hash:
+        try:
+            with get_session() as session:
+                user = session.get(User, user_id)
+                if user:
+                    user.hashed_password = hash_password(password)
+        except SQLAlchemyError:
+            logger.exception("Password hash upgrade failed for user %s", user_id)
+    
+    return True, "Login successful", user_id
 
 
 def get_user_by_id(user_id: int) -> Optional[dict]:
     """Get user information by ID."""
-    with get_session() as session:
-        user = session.query(User).filter(User.id == user_id).first()
+    with get_session(readonly=True) as session:
+        user = session.get(User, user_id)
         if not user:
             return None
         
@@ -95,29 +179,51 @@ def get_user_by_id(user_id: int) -> Optional[dict]:
         }
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def get_onboarding_status(user_id: int) -> Tuple[bool, bool]:
+    """
+    Check onboarding and clinical assessment completion in one query.
+    
+    Each table is read through its own scalar subquery, so a baseline
+    without a profile (or vice versa) is still reported correctly.
+    Results are cached for 5 minutes; call invalidate_onboarding_status
+    after writing a profile or baseline.
+    
+    Returns:
+        Tuple of (onboarding_completed: bool, assessment_completed: bool)
+    """
+    stmt = select(
+        select(UserProfile.age).where(UserProfile.user_id == user_id).scalar_subquery(),
+        select(HealthBaseline.phq9_score).where(HealthBaseline.user_id == user_id).scalar_subquery(),
+    )
+    with get_session(readonly=True) as session:
+        age, phq9_score = session.execute(stmt).one()
+        return age is not None, phq9_score is not None
+
+
+def invalidate_onboarding_status(user_id: int) -> None:
+    """Drop a user's cached onboarding status, e.g. after a profile or baseline write."""
+    get_onboarding_status.clear(user_id)
+
+
 def has_completed_onboarding(user_id: int) -> bool:
     """Check if user has completed the onboarding profile."""
-    with get_session() as session:
-        profile = session.query(UserProfile).filter(
-            UserProfile.user_id == user_id
-        ).first()
-        return profile is not None and profile.age is not None
+    return get_onboarding_status(user_id)[0]
 
 
 def has_completed_assessment(user_id: int) -> bool:
     """Check if user has completed the clinical assessment."""
-    with get_session() as session:
-        baseline = session.query(HealthBaseline).filter(
-            HealthBaseline.user_id == user_id
-        ).first()
-        return baseline is not None and baseline.phq9_score is not None
+    return get_onboarding_status(user_id)[1]
 
 
 def delete_user_account(user_id: int) -> bool:
     """Delete a user account and all associated data."""
     with get_session() as session:
-        user = session.query(User).filter(User.id == user_id).first()
-        if user:
+        user = session.get(User, user_id)
+        deleted = user is not None
+        if deleted:
             session.delete(user)
-            return True
-        return False
+    
+    if deleted:
+        invalidate_onboarding_status(user_id)
+    return deleted
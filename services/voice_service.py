@@ -2,48 +2,102 @@
 
 import streamlit as st
 import numpy as np
-from typing import Dict, Optional, Tuple
+from bisect import bisect_left
+from math import gcd
+from typing import Dict, List, Optional, Tuple, Union
 import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from config.constants import VOICE_TENSION_THRESHOLDS
+
+# Tension levels sorted by their upper bound, for bisecting a score into its level
+_TENSION_LEVELS = sorted(VOICE_TENSION_THRESHOLDS, key=lambda level: VOICE_TENSION_THRESHOLDS[level]["max"])
+_TENSION_BOUNDS = [VOICE_TENSION_THRESHOLDS[level]["max"] for level in _TENSION_LEVELS]
+
+# Interpretation message and color per tension level
+_TENSION_MESSAGES = {
+    "relaxed": ("Your voice sounds relaxed and calm.", "#66BB6A"),
+    "normal": ("Your voice sounds normal with moderate tension.", "#80CBC4"),
+    "mild_stress": ("Your voice shows signs of mild stress. Consider relaxation techniques.", "#FFA726"),
+    "high_stress": ("Your voice indicates high stress levels. Please consider professional support.", "#EF5350"),
+}
+
+# Analysis framing, matching the previous librosa.pyin settings
+_FRAME_LENGTH = 2048
+_HOP_LENGTH = 512
+
+# Pitch search range: C2 to C7
+_PITCH_FMIN = 65.406
+_PITCH_FMAX = 2093.005
+
+# Rate for the amplitude/spectral features; pitch stays at the native rate
+_FEATURE_SR = 16000
+
+# YIN dip threshold on the cumulative mean normalized difference
+_YIN_THRESHOLD = 0.1
+
+# Voice analysis libraries, resolved once at import. Feature extraction only
+# needs numpy: librosa decodes audio files and scipy resamples for the
+# non-pitch features
+try:
+    import librosa
+except ImportError:
+    librosa = None
+
+try:
+    import scipy.signal as scipy_signal
+except ImportError:
+    scipy_signal = None
+
+
+# Zero-crossing count: a compiled single-pass loop when numba is available
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _count_zero_crossings(x: np.ndarray) -> int:
+        """Count sign changes between consecutive samples."""
+        count = 0
+        if x.size == 0:
+            return count
+        prev = x[0] < 0
+        for i in range(1, x.size):
+            cur = x[i] < 0
+            count += cur != prev
+            prev = cur
+        return count
+except ImportError:
+    def _count_zero_crossings(x: np.ndarray) -> int:
+        """Count sign changes between consecutive samples."""
+        signs = np.signbit(x)
+        return int(np.count_nonzero(signs[1:] ^ signs[:-1]))
+
 
-# Lazy loading of voice analysis libraries
-@st.cache_resource
 def load_voice_libraries():
-    """Load voice analysis libraries (cached for performance)."""
-    try:
-        import librosa
-        import scipy.signal
-        return librosa, scipy.signal
-    except ImportError:
+    """Return the (librosa, scipy.signal) modules, reporting any that are missing."""
+    if not librosa or not scipy_signal:
         st.error("Librosa or scipy not installed. Please install with: pip install librosa scipy")
-        return None, None
+    return librosa, scipy_signal
 
 
-def analyze_voice_tension(audio_data: bytes, sample_rate: int = 44100) -> Dict:
+def analyze_voice_tension(audio_data: Union[bytes, np.ndarray], sample_rate: int = 44100) -> Dict:
     """
     Analyze vocal tension from audio data.
 
     Args:
-        audio_data: Raw audio bytes
+        audio_data: Raw float32 audio bytes, or an already decoded ndarray
         sample_rate: Audio sample rate
 
     Returns:
         Dict with tension analysis results
     """
-    librosa, scipy = load_voice_libraries()
-
-    if not librosa or not scipy:
-        return {
-            "tension_score": 50.0,  # Default neutral
-            "pitch_variability": 0.0,
-            "jitter": 0.0,
-            "shimmer": 0.0,
-            "analysis_successful": False,
-            "error": "Voice analysis libraries not available"
-        }
-
     try:
-        # Convert bytes to numpy array
-        audio_array = np.frombuffer(audio_data, dtype=np.float32)
+        # Use decoded arrays as-is; raw bytes are viewed as float32 without copying
+        if isinstance(audio_data, np.ndarray):
+            audio_array = audio_data
+        else:
+            audio_array = np.frombuffer(audio_data, dtype=np.float32)
 
         # Ensure audio is not empty
         if len(audio_array) == 0:
@@ -57,7 +111,7 @@ def analyze_voice_tension(audio_data: bytes, sample_rate: int = 44100) -> Dict:
             }
 
         # Extract features
-        features = extract_voice_features(audio_array, sample_rate, librosa, scipy)
+        features = extract_voice_features(audio_array, sample_rate)
 
         # Calculate tension score (0-100)
         tension_score = calculate_tension_score(features)
@@ -83,15 +137,124 @@ def analyze_voice_tension(audio_data: bytes, sample_rate: int = 44100) -> Dict:
         }
 
 
-def extract_voice_features(audio: np.ndarray, sr: int, librosa, scipy) -> Dict:
+def _analyze_one(item: Tuple[Union[bytes, np.ndarray], int]) -> Dict:
+    """Picklable analyze_voice_tension wrapper for process pool workers."""
+    audio_data, sample_rate = item
+    return analyze_voice_tension(audio_data, sample_rate)
+
+
+def analyze_voice_tension_batch(items: List[Tuple[Union[bytes, np.ndarray], int]],
+                                max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Analyze vocal tension for several recordings in parallel worker processes.
+
+    Args:
+        items: (audio_data, sample_rate) pairs, as accepted by analyze_voice_tension
+        max_workers: Process count (default: one per CPU, capped at the batch size)
+
+    Returns:
+        List of analysis result dicts, in input order
+    """
+    if len(items) <= 1:
+        return [_analyze_one(item) for item in items]
+
+    workers = min(len(items), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_analyze_one, items))
+
+
+def _frame_signal(audio: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Split audio into overlapping frames without copying.
+
+    Args:
+        audio: Audio signal
+        frame_length: Samples per frame
+        hop_length: Samples between frame starts
+
+    Returns:
+        Read-only (n_frames, frame_length) view; short signals are zero-padded to one frame
+    """
+    if len(audio) < frame_length:
+        audio = np.pad(audio, (0, frame_length - len(audio)))
+    return np.lib.stride_tricks.sliding_window_view(audio, frame_length)[::hop_length]
+
+
+def _yin_pitch(frames: np.ndarray, sr: int, fmin: float, fmax: float,
+               threshold: float = _YIN_THRESHOLD) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimate the fundamental frequency of each frame with YIN.
+
+    All frames are processed together: the difference function comes from an
+    FFT cross-correlation, followed by cumulative mean normalization, the
+    first dip under `threshold` and parabolic interpolation around it.
+
+    Args:
+        frames: (n_frames, frame_length) audio frames
+        sr: Sample rate
+        fmin: Lowest pitch to search for (Hz)
+        fmax: Highest pitch to search for (Hz)
+        threshold: Normalized difference below which a frame counts as voiced
+
+    Returns:
+        Tuple of (f0 in Hz with NaN for unvoiced frames, voiced flag per frame)
+    """
+    frames = frames.astype(np.float64)
+    n_frames, frame_length = frames.shape
+    win = frame_length // 2
+    max_tau = frame_length - win
+    tau_min = max(1, int(sr / fmax))
+    tau_max = min(max_tau - 1, int(np.ceil(sr / fmin)))
+
+    # d(tau) = E[0:W] + E[tau:tau+W] - 2 * sum(x[j] * x[j+tau]), for every frame at once
+    n_fft = 1 << int(np.ceil(np.log2(frame_length + win)))
+    spectrum = np.fft.rfft(frames, n_fft, axis=1)
+    window_spectrum = np.fft.rfft(frames[:, :win], n_fft, axis=1)
+    corr = np.fft.irfft(spectrum * np.conj(window_spectrum), n_fft, axis=1)[:, :max_tau + 1]
+
+    energy = np.concatenate((np.zeros((n_frames, 1)), np.cumsum(frames * frames, axis=1)), axis=1)
+    shifted_energy = energy[:, win:win + max_tau + 1] - energy[:, :max_tau + 1]
+    diff = np.maximum(energy[:, win:win + 1] + shifted_energy - 2 * corr, 0.0)
+
+    # Cumulative mean normalized difference; silent frames come out as 1 (unvoiced)
+    tau = np.arange(max_tau + 1)
+    running = np.cumsum(diff, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cmnd = np.where(running > 0, diff * tau / running, 1.0)
+    cmnd[:, 0] = 1.0
+
+    # First dip below the threshold inside the pitch range, then walk down to its minimum
+    below = cmnd[:, tau_min:tau_max + 1] < threshold
+    voiced = below.any(axis=1)
+    best = np.argmax(below, axis=1) + tau_min
+    rows = np.arange(n_frames)
+    for _ in range(tau_max - tau_min):
+        step = (best < tau_max) & (cmnd[rows, np.minimum(best + 1, max_tau)] < cmnd[rows, best])
+        if not step.any():
+            break
+        best += step
+
+    # Parabolic interpolation of the dip for sub-sample period resolution
+    left = cmnd[rows, best - 1]
+    center = cmnd[rows, best]
+    right = cmnd[rows, best + 1]
+    denom = left - 2 * center + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / denom, 0.0)
+    period = best + np.clip(shift, -1.0, 1.0)
+
+    f0 = np.where(voiced, sr / period, np.nan)
+    return f0, voiced
+
+
+def extract_voice_features(audio: np.ndarray, sr: int, target_sr: int = _FEATURE_SR) -> Dict:
     """
     Extract voice features for tension analysis.
 
     Args:
         audio: Audio signal
         sr: Sample rate
-        librosa: Librosa library
-        scipy: Scipy library
+        target_sr: Rate the non-pitch features are computed at when sr is higher
 
     Returns:
         Dict of extracted features
@@ -100,14 +263,8 @@ def extract_voice_features(audio: np.ndarray, sr: int, librosa, scipy) -> Dict:
 
     try:
         # Extract fundamental frequency (pitch)
-        f0, voiced_flag, voiced_probs = librosa.pyin(
-            audio,
-            fmin=librosa.note_to_hz('C2'),
-            fmax=librosa.note_to_hz('C7'),
-            sr=sr,
-            frame_length=2048,
-            hop_length=512
-        )
+        frames = _frame_signal(audio, _FRAME_LENGTH, _HOP_LENGTH)
+        f0, voiced_flag = _yin_pitch(frames, sr, _PITCH_FMIN, _PITCH_FMAX)
 
         # Filter out unvoiced frames
         f0_voiced = f0[voiced_flag]
@@ -123,26 +280,44 @@ def extract_voice_features(audio: np.ndarray, sr: int, librosa, scipy) -> Dict:
             pitch_diffs = np.abs(np.diff(f0_voiced))
             features["jitter"] = np.mean(pitch_diffs) / pitch_mean if pitch_mean > 0 else 0
 
-        # Extract amplitude envelope
-        amplitude = np.abs(audio)
-
-        # Shimmer (amplitude perturbation)
-        if len(amplitude) > 1000:
-            # Calculate amplitude differences
-            amp_diffs = np.abs(np.diff(amplitude))
-            features["shimmer"] = np.mean(amp_diffs) / np.mean(amplitude) if np.mean(amplitude) > 0 else 0
+        # Amplitude and spectral features don't need the full rate: resample and
+        # reframe with the same frame/hop durations
+        feature_audio, feature_sr, feature_frames = audio, sr, frames
+        if scipy_signal and sr > target_sr:
+            common = gcd(target_sr, sr)
+            feature_audio = scipy_signal.resample_poly(audio, target_sr // common, sr // common)
+            feature_sr = target_sr
+            feature_frames = _frame_signal(
+                feature_audio,
+                max(1, _FRAME_LENGTH * target_sr // sr),
+                max(1, _HOP_LENGTH * target_sr // sr)
+            )
+
+        # Shimmer (amplitude perturbation) from per-frame peak-to-peak amplitudes
+        if len(feature_frames) > 1:
+            peaks = feature_frames.max(axis=1) - feature_frames.min(axis=1)
+            peak_mean = np.mean(peaks)
+            features["shimmer"] = np.mean(np.abs(np.diff(peaks))) / peak_mean if peak_mean > 0 else 0
 
         # Spectral features
-        # Calculate spectral centroid (brightness of voice)
-        spectral_centroid = librosa.feature.spectral_centroid(y=audio, sr=sr)
+        # Calculate spectral centroid (brightness of voice), averaged over frames
+        frame_length = feature_frames.shape[1]
+        spectrum = np.abs(np.fft.rfft(feature_frames * np.hanning(frame_length), axis=1))
+        freqs = np.fft.rfftfreq(frame_length, 1 / feature_sr)
+        magnitude = spectrum.sum(axis=1)
+        spectral_centroid = np.divide(
+            spectrum @ freqs, magnitude, out=np.zeros_like(magnitude), where=magnitude > 0
+        )
         features["spectral_centroid"] = np.mean(spectral_centroid)
 
-        # Zero-crossing rate (voice quality indicator)
-        zcr = librosa.feature.zero_crossing_rate(audio)
-        features["zero_crossing_rate"] = np.mean(zcr)
+        # Zero-crossing rate (voice quality indicator), per native-rate sample so
+        # the scoring thresholds don't depend on the resampling
+        features["zero_crossing_rate"] = _count_zero_crossings(feature_audio) / len(audio)
 
-        # RMS energy
-        rms = librosa.feature.rms(y=audio)
+        # RMS energy per frame; einsum sums the squares without a temporary array
+        rms = np.sqrt(
+            np.einsum("ij,ij->i", feature_frames, feature_frames, dtype=np.float64) / frame_length
+        )
         features["rms_energy"] = np.mean(rms)
 
     except Exception as e:
@@ -169,44 +344,47 @@ def calculate_tension_score(features: Dict) -> float:
     Returns:
         Tension score (0-100)
     """
-    score = 50.0  # Start at neutral
+    return float(calculate_tension_scores(features)[0])
 
-    # Pitch variability (higher = more tense)
-    pitch_var = features.get("pitch_variability", 0.0)
-    if pitch_var > 20:  # High variability indicates tension
-        score += min(20, (pitch_var - 20) / 2)
-    elif pitch_var < 5:  # Very low variability might indicate monotone/stress
-        score += 10
+
+def calculate_tension_scores(batched_features: Dict) -> np.ndarray:
+    """
+    Calculate vocal tension scores for many analysis windows at once.
+
+    Args:
+        batched_features: Dict of voice features, each a scalar or a 1-D array
+            with one value per window (missing features count as 0.0)
+
+    Returns:
+        Array of tension scores (0-100), one per window
+    """
+    names = ("pitch_variability", "jitter", "shimmer", "spectral_centroid", "zero_crossing_rate", "rms_energy")
+    pitch_var, jitter, shimmer, centroid, zcr, rms = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(batched_features.get(name, 0.0), dtype=np.float64)) for name in names
+    ))
+
+    score = np.full(pitch_var.shape, 50.0)  # Start at neutral
+
+    # Pitch variability (high variability indicates tension; very low might indicate monotone/stress)
+    score += np.where(pitch_var > 20, np.minimum(20, (pitch_var - 20) / 2), np.where(pitch_var < 5, 10, 0))
 
     # Jitter (higher = more tense)
-    jitter = features.get("jitter", 0.0)
-    if jitter > 0.01:
-        score += min(15, jitter * 1000)
+    score += np.where(jitter > 0.01, np.minimum(15, jitter * 1000), 0)
 
     # Shimmer (higher = more tense)
-    shimmer = features.get("shimmer", 0.0)
-    if shimmer > 0.1:
-        score += min(10, shimmer * 50)
+    score += np.where(shimmer > 0.1, np.minimum(10, shimmer * 50), 0)
 
-    # Spectral centroid (higher frequency = more tense)
-    centroid = features.get("spectral_centroid", 0.0)
-    if centroid > 3000:  # High frequency content
-        score += min(10, (centroid - 3000) / 500)
+    # Spectral centroid (higher frequency content = more tense)
+    score += np.where(centroid > 3000, np.minimum(10, (centroid - 3000) / 500), 0)
 
     # Zero crossing rate (higher = more tense/strained voice)
-    zcr = features.get("zero_crossing_rate", 0.0)
-    if zcr > 0.15:
-        score += min(5, (zcr - 0.15) * 100)
+    score += np.where(zcr > 0.15, np.minimum(5, (zcr - 0.15) * 100), 0)
 
-    # RMS energy (very low or very high might indicate tension)
-    rms = features.get("rms_energy", 0.0)
-    if rms < 0.05:  # Very quiet voice
-        score += 10
-    elif rms > 0.3:  # Very loud/shouty voice
-        score += 15
+    # RMS energy (very quiet or very loud/shouty voice might indicate tension)
+    score += np.where(rms < 0.05, 10, np.where(rms > 0.3, 15, 0))
 
-    # Ensure score is within 0-100 range
-    return max(0.0, min(100.0, score))
+    # Ensure scores are within 0-100 range
+    return np.clip(score, 0.0, 100.0)
 
 
 def get_tension_interpretation(tension_score: float) -> Dict:
@@ -219,24 +397,10 @@ def get_tension_interpretation(tension_score: float) -> Dict:
     Returns:
         Dict with interpretation
     """
-    from config.constants import VOICE_TENSION_THRESHOLDS
-
-    if tension_score <= VOICE_TENSION_THRESHOLDS["relaxed"]["max"]:
-        level = "relaxed"
-        message = "Your voice sounds relaxed and calm."
-        color = "#66BB6A"
-    elif tension_score <= VOICE_TENSION_THRESHOLDS["normal"]["max"]:
-        level = "normal"
-        message = "Your voice sounds normal with moderate tension."
-        color = "#80CBC4"
-    elif tension_score <= VOICE_TENSION_THRESHOLDS["mild_stress"]["max"]:
-        level = "mild_stress"
-        message = "Your voice shows signs of mild stress. Consider relaxation techniques."
-        color = "#FFA726"
-    else:
-        level = "high_stress"
-        message = "Your voice indicates high stress levels. Please consider professional support."
-        color = "#EF5350"
+    # First level whose upper bound is >= the score; anything above the top bound is the top level
+    index = min(bisect_left(_TENSION_BOUNDS, tension_score), len(_TENSION_LEVELS) - 1)
+    level = _TENSION_LEVELS[index]
+    message, color = _TENSION_MESSAGES[level]
 
     return {
         "level": level,
@@ -256,8 +420,6 @@ def process_audio_file(file_path: str) -> Dict:
     Returns:
         Dict with analysis results
     """
-    librosa, _ = load_voice_libraries()
-
     if not librosa:
         return {
             "tension_score": 50.0,
@@ -269,11 +431,8 @@ def process_audio_file(file_path: str) -> Dict:
         # Load audio file
         audio, sr = librosa.load(file_path, sr=None)
 
-        # Convert to bytes-like object for analysis
-        audio_bytes = audio.tobytes()
-
-        # Analyze
-        return analyze_voice_tension(audio_bytes, sr)
+        # Analyze the decoded array directly
+        return analyze_voice_tension(audio, sr)
 
     except Exception as e:
         return {
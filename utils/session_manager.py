@@ -1,24 +1,27 @@
 """Session state management utilities for Streamlit."""
 
 import streamlit as st
+from copy import copy
 from typing import Any, Optional
 
+# Session state defaults; mutable values are copied per session in init_session_state
+_SESSION_DEFAULTS = {
+    "user_id": None,
+    "username": None,
+    "page": "auth",
+    "onboarding_step": 1,
+    "onboarding_data": {},
+    "assessment_data": {},
+    "show_assessment_results": False,
+}
+
 
 def init_session_state():
     """Initialize all session state variables with defaults."""
-    defaults = {
-        "user_id": None,
-        "username": None,
-        "page": "auth",
-        "onboarding_step": 1,
-        "onboarding_data": {},
-        "assessment_data": {},
-        "show_assessment_results": False,
-    }
-    
-    for key, default_value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = default_value
+    ss = st.session_state
+    missing = {key: copy(value) for key, value in _SESSION_DEFAULTS.items() if key not in ss}
+    if missing:
+        ss.update(missing)
 
 
 def is_authenticated() -> bool:
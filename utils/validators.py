@@ -1,13 +1,39 @@
 """Input validation utilities."""
 
 import re
+import string
 from typing import Tuple
 
+# Compiled once at import; the signup form runs these on every submit
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+_USERNAME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9_]*\Z')
+_HTML_TAG_RE = re.compile(r'<[^<>]*>')  # no '<' inside, so each scan stops at the next tag start
+
+# Password letter classes, matching the previous [A-Z]/[a-z] patterns
+# (digits use str.isdecimal, which is what \d matched)
+_UPPER_CHARS = frozenset(string.ascii_uppercase)
+_LOWER_CHARS = frozenset(string.ascii_lowercase)
+
+# Input size limits checked before any regex runs (RFC 5321 caps addresses at 254)
+_MAX_EMAIL_LENGTH = 254
+_MAX_TEXT_LENGTH = 100_000
+
+# HTML escapes plus null-byte removal for sanitize_text_input
+_SANITIZE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+    '\x00': '',
+})
+
 
 def validate_email(email: str) -> bool:
     """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    if not email or len(email) > _MAX_EMAIL_LENGTH or '@' not in email:
+        return False
+    return bool(_EMAIL_RE.match(email))
 
 
 def validate_password_strength(password: str) -> Tuple[bool, str]:
@@ -23,16 +49,28 @@ def validate_password_strength(password: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid: bool, message: str)
     """
-    if len(password) < 8:
+    if not password or len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
-    if not re.search(r'[A-Z]', password):
+    # One pass over the password, stopping once every character class is seen
+    has_upper = has_lower = has_digit = False
+    for char in password:
+        if char in _UPPER_CHARS:
+            has_upper = True
+        elif char in _LOWER_CHARS:
+            has_lower = True
+        elif char.isdecimal():
+            has_digit = True
+        if has_upper and has_lower and has_digit:
+            break
+    
+    if not has_upper:
         return False, "Password must contain at least one uppercase letter"
     
-    if not re.search(r'[a-z]', password):
+    if not has_lower:
         return False, "Password must contain at least one lowercase letter"
     
-    if not re.search(r'\d', password):
+    if not has_digit:
         return False, "Password must contain at least one digit"
     
     return True, "Password meets requirements"
@@ -50,13 +88,13 @@ def validate_username(username: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid: bool, message: str)
     """
-    if len(username) < 3:
+    if not username or len(username) < 3:
         return False, "Username must be at least 3 characters long"
     
     if len(username) > 30:
         return False, "Username must not exceed 30 characters"
     
-    if not re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', username):
+    if not _USERNAME_RE.match(username):
         return False, "Username must start with a letter and contain only letters, numbers, and underscores"
     
     return True, "Username is valid"
@@ -75,20 +113,12 @@ def sanitize_text_input(text: str) -> str:
     if not text:
         return ""
     
-    # Remove HTML tags
-    text = re.sub(r'<[^>]*>', '', text)
-    
-    # Escape special HTML characters
-    text = text.replace('&', '&amp;')
-    text = text.replace('<', '&lt;')
-    text = text.replace('>', '&gt;')
-    text = text.replace('"', '&quot;')
-    text = text.replace("'", '&#x27;')
-    
-    # Remove null bytes
-    text = text.replace('\x00', '')
+    # Bound pathological pastes before the regex scan
+    if len(text) > _MAX_TEXT_LENGTH:
+        text = text[:_MAX_TEXT_LENGTH]
     
-    return text.strip()
+    # Remove HTML tags, then escape special HTML characters and drop null bytes in one pass
+    return _HTML_TAG_RE.sub('', text).translate(_SANITIZE_TABLE).strip()
 
 
 def validate_age(age: int) -> Tuple[bool, str]: